@@ -2,19 +2,19 @@
 Dependency injection for FastAPI routes.
 Provides reusable dependencies for request handling.
 """
-from fastapi import Depends
-from app.config import Settings, get_settings
+from functools import lru_cache
+from app.config import get_settings
 from app.services.detection_service import DetectionService
 
 
-def get_detection_service(settings: Settings = Depends(get_settings)) -> DetectionService:
+@lru_cache()
+def get_detection_service() -> DetectionService:
     """
     Dependency to inject DetectionService into routes.
+    Using lru_cache ensures a single service instance across the application
+    instead of constructing one per request.
     
-    Args:
-        settings: Application settings
-        
     Returns:
         DetectionService instance
     """
-    return DetectionService(settings)
+    return DetectionService(get_settings())
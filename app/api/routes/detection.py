@@ -2,32 +2,45 @@
 Detection endpoints for weapon detection.
 Provides image and video stream detection capabilities.
 """
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from typing import Optional
-import json
+import logging
 
 from app.api.dependencies import get_detection_service
 from app.services.detection_service import DetectionService
 from app.models.schemas import (
     ImageDetectionResponse,
-    VideoStreamConfig,
     VideoFrameDetection,
-    ErrorResponse
+    ErrorResponse,
+    IMAGE_RESPONSE_ADAPTER,
+    FRAME_RESPONSE_ADAPTER
 )
 from app.core.exceptions import (
     WeaponDetectionException,
     InvalidImageException,
     ImageTooLargeException
 )
-from app.utils.image_processing import validate_image_format
-from app.config import Settings, get_settings
+from app.utils.image_processing import validate_image_format, read_upload
+from app.config import get_settings
 from app.core.logging import get_logger
 
 logger = get_logger("detection_routes")
 
+# Settings are immutable after startup; read the cached instance directly
+settings = get_settings()
+
 router = APIRouter(prefix="/detect", tags=["Detection"])
 
+# MJPEG multipart framing, built once instead of per frame
+FRAME_HEADER_TEMPLATE = (
+    b"--frame\r\nContent-Type: image/jpeg\r\n"
+    b"X-Detection-Count: %d\r\n"
+    b"X-Inference-Time: %.2fms\r\n"
+    b"X-Has-Weapons: %s\r\n\r\n"
+)
+FRAME_TRAILER = b"\r\n"
+
 
 @router.post(
     "/image",
@@ -53,9 +66,8 @@ async def detect_image(
         False,
         description="Save annotated image to disk"
     ),
-    settings: Settings = Depends(get_settings),
     detection_service: DetectionService = Depends(get_detection_service)
-) -> ImageDetectionResponse:
+) -> Response:
     """
     Detect weapons in an uploaded image.
     
@@ -77,14 +89,14 @@ async def detect_image(
     """
     try:
         # Validate file format
-        if not validate_image_format(file.filename, settings.allowed_image_formats):
+        if not validate_image_format(file.filename, settings.allowed_image_extensions):
             raise InvalidImageException(
-                f"Invalid image format. Supported formats: {', '.join(settings.allowed_image_formats)}",
+                f"Invalid image format. Supported formats: {settings.allowed_image_formats_text}",
                 details={"filename": file.filename}
             )
         
-        # Read image data
-        image_data = await file.read()
+        # Read image data (size limit enforced while streaming the upload)
+        image_data = await read_upload(file, settings.max_image_size)
         
         # Perform detection
         result = await detection_service.detect_from_image_file(
@@ -93,12 +105,14 @@ async def detect_image(
             save_result=save_result
         )
         
-        logger.info(
-            f"Image detection completed: {file.filename} - "
-            f"{result.detection_count} detections in {result.inference_time_ms}ms"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"Image detection completed: {file.filename} - "
+                f"{result.detection_count} detections in {result.inference_time_ms}ms"
+            )
         
-        return result
+        # Serialize with the prebuilt adapter instead of FastAPI's per-call encoding
+        return Response(content=IMAGE_RESPONSE_ADAPTER.dump_json(result), media_type="application/json")
         
     except WeaponDetectionException as e:
         logger.error(f"Detection error: {e.message}")
@@ -142,7 +156,6 @@ async def detect_image_annotated(
         le=1.0,
         description="Minimum confidence threshold for detections (overrides default)"
     ),
-    settings: Settings = Depends(get_settings),
     detection_service: DetectionService = Depends(get_detection_service)
 ):
     """
@@ -168,14 +181,14 @@ async def detect_image_annotated(
     """
     try:
         # Validate file format
-        if not validate_image_format(file.filename, settings.allowed_image_formats):
+        if not validate_image_format(file.filename, settings.allowed_image_extensions):
             raise InvalidImageException(
-                f"Invalid image format. Supported formats: {', '.join(settings.allowed_image_formats)}",
+                f"Invalid image format. Supported formats: {settings.allowed_image_formats_text}",
                 details={"filename": file.filename}
             )
         
-        # Read image data
-        image_data = await file.read()
+        # Read image data (size limit enforced while streaming the upload)
+        image_data = await read_upload(file, settings.max_image_size)
         
         # Perform detection and get annotated image
         annotated_bytes, result = await detection_service.detect_and_annotate_image(
@@ -183,16 +196,16 @@ async def detect_image_annotated(
             confidence_threshold=confidence_threshold
         )
         
-        logger.info(
-            f"Annotated image detection completed: {file.filename} - "
-            f"{result.detection_count} detections in {result.inference_time_ms}ms"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"Annotated image detection completed: {file.filename} - "
+                f"{result.detection_count} detections in {result.inference_time_ms}ms"
+            )
         
         # Since this is a weapon detection model, all detections are weapons
         weapon_count = result.detection_count
         
         # Create response with metadata headers
-        from fastapi import Response
         response = Response(
             content=annotated_bytes,
             media_type="image/jpeg",
@@ -288,20 +301,18 @@ async def detect_video_stream(
         async def frame_generator():
             """Generate video frames with detections."""
             try:
-                for frame_bytes, detection_result in detection_service.generate_video_stream(
+                async for frame_bytes, detection_result in detection_service.generate_video_stream(
                     camera_id=camera_id,
                     confidence_threshold=confidence_threshold,
                     frame_skip=frame_skip
                 ):
                     # Create multipart response with detection metadata
-                    yield (
-                        b'--frame\r\n'
-                        b'Content-Type: image/jpeg\r\n'
-                        b'X-Detection-Count: ' + str(detection_result.detection_count).encode() + b'\r\n'
-                        b'X-Inference-Time: ' + str(detection_result.inference_time_ms).encode() + b'ms\r\n'
-                        b'X-Has-Weapons: ' + str(detection_result.has_weapons).lower().encode() + b'\r\n'
-                        b'\r\n' + frame_bytes + b'\r\n'
+                    header = FRAME_HEADER_TEMPLATE % (
+                        detection_result.detection_count,
+                        detection_result.inference_time_ms,
+                        b"true" if detection_result.has_weapons else b"false"
                     )
+                    yield b"".join((header, frame_bytes, FRAME_TRAILER))
                     
             except Exception as e:
                 logger.error(f"Stream generation error: {str(e)}")
@@ -352,7 +363,7 @@ async def detect_camera_frame(
         description="Minimum confidence threshold"
     ),
     detection_service: DetectionService = Depends(get_detection_service)
-) -> VideoFrameDetection:
+) -> Response:
     """
     Capture and analyze a single frame from camera.
     
@@ -384,7 +395,7 @@ async def detect_camera_frame(
             f"{detection_result.detection_count} detections"
         )
         
-        return detection_result
+        return Response(content=FRAME_RESPONSE_ADAPTER.dump_json(detection_result), media_type="application/json")
         
     except WeaponDetectionException as e:
         logger.error(f"Camera detection error: {e.message}")
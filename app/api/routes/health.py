@@ -2,15 +2,30 @@
 Health check endpoints.
 Provides system status and readiness checks.
 """
-from fastapi import APIRouter, Depends
-import torch
+from fastapi import APIRouter
+from functools import lru_cache
 
-from app.config import Settings, get_settings
+from app.config import get_settings
 from app.models.yolo_model import get_model
 from app.models.schemas import HealthResponse
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
+settings = get_settings()
+
+@lru_cache()
+def gpu_available() -> bool:
+    """
+    Check CUDA availability.
+    Hardware doesn't change while the process runs, so the driver is queried once
+    (and torch imported on first use rather than at app import).
+    
+    Returns:
+        True if a CUDA device is available
+    """
+    import torch
+    return torch.cuda.is_available()
+
 
 @router.get(
     "",
@@ -18,7 +33,7 @@ router = APIRouter(prefix="/health", tags=["Health"])
     summary="Health Check",
     description="Check if the API is running and ready to accept requests"
 )
-async def health_check(settings: Settings = Depends(get_settings)) -> HealthResponse:
+async def health_check() -> HealthResponse:
     """
     Perform health check on the API.
     
@@ -34,7 +49,7 @@ async def health_check(settings: Settings = Depends(get_settings)) -> HealthResp
         status="healthy",
         version=settings.app_version,
         model_loaded=model.is_loaded,
-        gpu_available=torch.cuda.is_available()
+        gpu_available=gpu_available()
     )
 
 
@@ -57,5 +72,5 @@ async def readiness_check() -> dict:
     
     return {
         "status": "ready",
-        "model_info": model.model_info
+        "model_info": dict(model.model_info)
     }
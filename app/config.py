@@ -2,10 +2,10 @@
 Configuration module for the Weapon Detection API.
 Centralized settings management using Pydantic.
 """
-from pydantic_settings import BaseSettings
-from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import lru_cache, cached_property
 from pathlib import Path
-from typing import List
+from typing import FrozenSet, List, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -32,18 +32,43 @@ class Settings(BaseSettings):
     confidence_threshold: float = 0.4
     iou_threshold: float = 0.45
     max_detections: int = 100
+    imgsz: Optional[int] = None  # Model input size (None uses the checkpoint's training size)
     
     # GPU Settings
-    device: str = "cuda"  # Use "cpu" if CUDA not available
+    device: Literal["cuda", "cpu", "mps"] = "cuda"  # Use "cpu" if CUDA not available
     half_precision: bool = True  # Use FP16 for faster inference on supported GPUs
+    export_tensorrt: bool = False  # Export to a TensorRT engine at startup and serve it
+    int8: bool = False  # INT8 quantization for the TensorRT / ONNX export
+    calibration_data: Optional[str] = None  # Dataset YAML for INT8 calibration (Ultralytics default if unset)
+    trt_workspace_gb: float = 4.0  # TensorRT builder workspace size
+    export_onnx: bool = False  # Export to ONNX and serve it with ONNX Runtime (cpu)
+    compile_model: bool = False  # torch.compile the network for the fixed input shape
+    cudnn_benchmark: bool = True  # Autotune conv kernels per input shape (cuda)
+    channels_last: bool = True  # NHWC weights for Tensor Core kernels (cuda)
+    
+    # Batching Settings
+    batch_max_size: int = 16  # Max images coalesced into one forward pass
+    batch_max_latency_ms: float = 10.0  # Max time to wait for a batch to fill
     
     # Image Processing Settings
     max_image_size: int = 10 * 1024 * 1024  # 10MB
     allowed_image_formats: List[str] = [".jpg", ".jpeg", ".png", ".bmp", ".webp"]
+    jpeg_quality: int = 85  # Quality of annotated JPEG output
+    gpu_jpeg: bool = False  # Encode annotated JPEGs on the GPU with nvJPEG (cuda, via torchvision)
+    skip_plot_if_empty: bool = True  # Return the input image as-is when there is nothing to draw
+    result_cache_size: int = 512  # Cached results for identical uploads (0 to disable)
+    result_cache_dir: Optional[Path] = None  # Also persist cached results on disk
+    trusted_internal: bool = True  # Skip validation when assembling responses from model output
     
     # Video Processing Settings
     video_fps: int = 30
     video_frame_skip: int = 0  # Process every frame, increase to skip frames
+    adaptive_frame_skip: bool = True  # Skip extra frames while inference is slower than the camera
+    capture_width: Optional[int] = None  # Requested camera resolution (None matches the model input, 0 keeps the driver default)
+    capture_height: Optional[int] = None
+    capture_fourcc: Optional[str] = "MJPG"  # Compressed USB transfer (None keeps the driver default)
+    fused_preprocess: bool = True  # Convert (and letterbox on CPU) frames to tensors in one fused pass
+    stream_batch_size: int = 4  # Max backed-up frames of one stream inferred together
     max_video_duration: int = 300  # 5 minutes max for video processing
     
     # Logging Settings
@@ -55,15 +80,51 @@ class Settings(BaseSettings):
     runs_dir: Path = base_dir / "runs"
     logs_dir: Path = base_dir / "logs"
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", frozen=True)
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Create directories if they don't exist
         self.runs_dir.mkdir(exist_ok=True)
         self.logs_dir.mkdir(exist_ok=True)
+    
+    def with_device(self, device: str, half_precision: bool) -> "Settings":
+        """
+        Copy of these (frozen) settings targeting another device.
+        
+        Args:
+            device: Inference device
+            half_precision: Whether FP16 is enabled on that device
+        
+        Returns:
+            New Settings instance with device-derived properties recomputed
+        """
+        copied = self.model_copy(update={"device": device, "half_precision": half_precision})
+        for name in ("torch_device", "torch_dtype"):
+            copied.__dict__.pop(name, None)
+        return copied
+    
+    @cached_property
+    def torch_device(self) -> "torch.device":
+        """Inference device, resolved once instead of parsing `device` per call."""
+        import torch
+        return torch.device(self.device)
+    
+    @cached_property
+    def torch_dtype(self) -> "torch.dtype":
+        """Model input dtype: FP16 on CUDA with half precision enabled, FP32 otherwise."""
+        import torch
+        return torch.float16 if self.half_precision and self.device == "cuda" else torch.float32
+    
+    @cached_property
+    def allowed_image_extensions(self) -> FrozenSet[str]:
+        """Lowercased allowed extensions, for O(1) membership checks."""
+        return frozenset(fmt.lower() for fmt in self.allowed_image_formats)
+    
+    @cached_property
+    def allowed_image_formats_text(self) -> str:
+        """Comma-separated allowed formats, for error messages."""
+        return ", ".join(self.allowed_image_formats)
 
 
 @lru_cache()
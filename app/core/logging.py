@@ -3,11 +3,16 @@ Logging configuration for the Weapon Detection API.
 Provides structured logging with file and console handlers.
 """
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
+# Background thread that performs all handler I/O (see setup_logging)
+_listener: Optional[logging.handlers.QueueListener] = None
+
 
 def setup_logging(
     log_level: str = "INFO",
@@ -16,6 +21,7 @@ def setup_logging(
 ) -> logging.Logger:
     """
     Setup application logging with both file and console handlers.
+    Handlers run on a background QueueListener thread so logging never blocks callers.
     
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -31,19 +37,26 @@ def setup_logging(
     # Create formatter
     formatter = logging.Formatter(log_format)
     
+    level = getattr(logging, log_level.upper())
+    
     # Get root logger
     logger = logging.getLogger("weapon_detection")
-    logger.setLevel(getattr(logging, log_level.upper()))
+    logger.setLevel(level)
     
     # Remove existing handlers to avoid duplicates
+    stop_logging()
     logger.handlers = []
+    handlers = []
+    
+    # Force UTF-8 console output for Windows compatibility (idempotent, no new wrapper)
+    if (sys.stdout.encoding or "").lower() != "utf-8" and hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8", errors="replace")
     
-    # Console handler with UTF-8 encoding for Windows compatibility
-    import io
-    console_handler = logging.StreamHandler(io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace'))
-    console_handler.setLevel(logging.DEBUG)
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler with UTF-8 encoding (if log directory is provided)
     if log_dir:
@@ -52,11 +65,41 @@ def setup_logging(
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Logging calls only enqueue the record; console/file writes happen on the listener thread
+    global _listener
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    _listener = logging.handlers.QueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    logger.addHandler(queue_handler)
     
     return logger
 
 
+def stop_logging() -> None:
+    """
+    Flush pending log records and stop the background logging thread.
+    The console/file handlers are attached to the logger directly again, so
+    records logged afterwards are still written (synchronously) instead of
+    piling up in a queue nothing drains.
+    """
+    global _listener
+    if _listener is None:
+        return
+    
+    _listener.stop()
+    logger = logging.getLogger("weapon_detection")
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is _listener.queue:
+            logger.removeHandler(handler)
+    for handler in _listener.handlers:
+        logger.addHandler(handler)
+    _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a specific module.
@@ -4,14 +4,18 @@ Enterprise-grade weapon detection API with professional architecture.
 """
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
 import time
+import orjson
 
 from app.config import get_settings
-from app.core.logging import setup_logging, get_logger
+from app.core.logging import setup_logging, stop_logging, get_logger
 from app.core.exceptions import WeaponDetectionException
 from app.models.yolo_model import get_model
+from app.services.batcher import get_batcher
+from app.services.camera_pool import get_camera_pool
+from app.services.result_writer import get_result_writer
 from app.api.routes import detection, health
 
 # Initialize settings
@@ -44,6 +48,16 @@ async def lifespan(app: FastAPI):
         model.load_model(settings)
         logger.info("[OK] Model loaded successfully")
         
+        # Start dynamic batcher
+        get_batcher().start(settings)
+        logger.info(
+            f"[OK] Dynamic batcher: max batch {settings.batch_max_size}, "
+            f"max latency {settings.batch_max_latency_ms}ms"
+        )
+        
+        # Start background writer for saved results
+        get_result_writer().start()
+        
         logger.info(f"[OK] Device: {model.device}")
         logger.info(f"[OK] Model path: {settings.model_path}")
         logger.info(f"[OK] Confidence threshold: {settings.confidence_threshold}")
@@ -59,7 +73,11 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application...")
+    await get_batcher().stop()
+    get_camera_pool().close()
+    await get_result_writer().stop()
     logger.info("Cleanup completed")
+    stop_logging()
 
 
 # Create FastAPI application
@@ -99,13 +117,14 @@ async def add_process_time_header(request: Request, call_next):
 @app.exception_handler(WeaponDetectionException)
 async def weapon_detection_exception_handler(request: Request, exc: WeaponDetectionException):
     """Handle custom application exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
+    return Response(
+        content=orjson.dumps({
             "error": exc.message,
             "details": exc.details,
             "path": str(request.url)
-        }
+        }),
+        status_code=exc.status_code,
+        media_type="application/json"
     )
 
 
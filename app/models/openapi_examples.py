@@ -0,0 +1,60 @@
+"""
+OpenAPI examples for the API schemas.
+Built once at import and shared by the schema classes.
+"""
+
+BOUNDING_BOX_EXAMPLE = {
+    "x1": 100.5,
+    "y1": 200.3,
+    "x2": 300.7,
+    "y2": 400.9
+}
+
+DETECTION_EXAMPLE = {
+    "class_name": "Gun",
+    "confidence": 0.92,
+    "bounding_box": BOUNDING_BOX_EXAMPLE,
+    "class_id": 1
+}
+
+EXAMPLES = {
+    "Detection": DETECTION_EXAMPLE,
+    "ImageDetectionRequest": {
+        "confidence_threshold": 0.5,
+        "save_result": True
+    },
+    "ImageDetectionResponse": {
+        "detections": [DETECTION_EXAMPLE],
+        "detection_count": 1,
+        "inference_time_ms": 45.2,
+        "image_size": [1920, 1080],
+        "timestamp_ms": 1704888000000,
+        "has_weapons": True
+    },
+    "VideoStreamConfig": {
+        "camera_id": 0,
+        "confidence_threshold": 0.5,
+        "frame_skip": 2,
+        "save_frames": False
+    },
+    "VideoFrameDetection": {
+        "frame_number": 42,
+        "detections": [],
+        "detection_count": 0,
+        "inference_time_ms": 38.5,
+        "timestamp_ms": 1704888000000,
+        "has_weapons": False
+    },
+    "HealthResponse": {
+        "status": "healthy",
+        "version": "1.0.0",
+        "model_loaded": True,
+        "gpu_available": True,
+        "timestamp": "2024-01-10T12:00:00Z"
+    },
+    "ErrorResponse": {
+        "error": "Invalid image format",
+        "detail": "Supported formats: .jpg, .jpeg, .png, .bmp, .webp",
+        "timestamp": "2024-01-10T12:00:00Z"
+    }
+}
@@ -2,119 +2,115 @@
 Pydantic schemas for request/response validation.
 Ensures type safety and automatic API documentation.
 """
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Tuple
-from datetime import datetime
-from enum import Enum
-
-
-class DetectionClass(str, Enum):
-    """Enumeration of detectable weapon types."""
-    WEAPON = "weapon"
-    GUN = "gun"
-    KNIFE = "knife"
-    # Add more weapon types as needed based on your model
-
-
-class BoundingBox(BaseModel):
-    """Bounding box coordinates for detected objects."""
-    x1: float = Field(..., description="Top-left X coordinate")
-    y1: float = Field(..., description="Top-left Y coordinate")
-    x2: float = Field(..., description="Bottom-right X coordinate")
-    y2: float = Field(..., description="Bottom-right Y coordinate")
-    
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "x1": 100.5,
-                "y1": 200.3,
-                "x2": 300.7,
-                "y2": 400.9
-            }
-        }
-    )
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, computed_field
+from typing import List, Literal, Optional, Tuple
+from datetime import datetime, timezone
+import time
+from typing_extensions import TypedDict
+
+from app.models.openapi_examples import EXAMPLES
+
+
+# Deprecated: kept only so existing imports keep working. Class names come from the
+# loaded weights, so Detection.class_name is a plain str (best.pt names listed here)
+DetectionClass = Literal["Grenade", "Gun", "Knife", "Pistol", "handgun", "rifle"]
+
+
+# Sentinel for "no threshold given": a plain float validates faster than Optional[float]
+USE_DEFAULT_CONFIDENCE = -1.0
+
+
+def utc_now() -> datetime:
+    """Current time as a timezone-aware UTC datetime (serialized with a UTC offset)."""
+    return datetime.now(timezone.utc)
+
+
+def epoch_ms() -> int:
+    """Current Unix time in milliseconds (cheaper to build and serialize than a datetime)."""
+    return time.time_ns() // 1_000_000
+
+
+class BoundingBox(TypedDict):
+    """Bounding box coordinates for detected objects (serialized shape)."""
+    x1: float
+    y1: float
+    x2: float
+    y2: float
 
 
 class Detection(BaseModel):
     """Single detection result."""
     class_name: str = Field(..., description="Detected object class name")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Detection confidence score")
-    bounding_box: BoundingBox = Field(..., description="Bounding box coordinates")
+    bbox: Tuple[float, float, float, float] = Field(
+        ...,
+        exclude=True,
+        description="Bounding box as (x1, y1, x2, y2)"
+    )
     class_id: int = Field(..., description="Class ID from the model")
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "class_name": "gun",
-                "confidence": 0.92,
-                "bounding_box": {
-                    "x1": 100.5,
-                    "y1": 200.3,
-                    "x2": 300.7,
-                    "y2": 400.9
-                },
-                "class_id": 0
-            }
-        }
-    )
+    @computed_field(description="Bounding box coordinates")
+    @property
+    def bounding_box(self) -> BoundingBox:
+        """Bounding box in the API's {x1, y1, x2, y2} shape."""
+        x1, y1, x2, y2 = self.bbox
+        return {"x1": x1, "y1": y1, "x2": x2, "y2": y2}
+    
+    @classmethod
+    def fast_build(
+        cls,
+        class_name: str,
+        confidence: float,
+        bbox: Tuple[float, float, float, float],
+        class_id: int
+    ) -> "Detection":
+        """Build a detection from trusted model output without running validation."""
+        return cls.model_construct(
+            class_name=class_name,
+            confidence=confidence,
+            bbox=bbox,
+            class_id=class_id
+        )
+    
+    model_config = ConfigDict(json_schema_extra={"example": EXAMPLES["Detection"]})
 
 
 class ImageDetectionRequest(BaseModel):
     """Request schema for image detection (optional metadata)."""
-    confidence_threshold: Optional[float] = Field(
-        None,
-        ge=0.0,
+    confidence_threshold: float = Field(
+        USE_DEFAULT_CONFIDENCE,
+        ge=-1.0,
         le=1.0,
-        description="Minimum confidence threshold for detections"
+        description="Minimum confidence threshold for detections (negative uses the server default)"
     )
     save_result: bool = Field(
         False,
         description="Whether to save annotated image"
     )
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "confidence_threshold": 0.5,
-                "save_result": True
-            }
-        }
-    )
+    model_config = ConfigDict(json_schema_extra={"example": EXAMPLES["ImageDetectionRequest"]})
 
 
 class ImageDetectionResponse(BaseModel):
     """Response schema for image detection."""
     detections: List[Detection] = Field(..., description="List of detected objects")
-    detection_count: int = Field(..., description="Total number of detections")
     inference_time_ms: float = Field(..., description="Inference time in milliseconds")
     image_size: Tuple[int, int] = Field(..., description="Original image dimensions (width, height)")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Detection timestamp")
-    has_weapons: bool = Field(..., description="Whether any weapons were detected")
+    timestamp_ms: int = Field(default_factory=epoch_ms, description="Detection time (Unix epoch, milliseconds)")
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "detections": [
-                    {
-                        "class_name": "gun",
-                        "confidence": 0.92,
-                        "bounding_box": {
-                            "x1": 100.5,
-                            "y1": 200.3,
-                            "x2": 300.7,
-                            "y2": 400.9
-                        },
-                        "class_id": 0
-                    }
-                ],
-                "detection_count": 1,
-                "inference_time_ms": 45.2,
-                "image_size": [1920, 1080],
-                "timestamp": "2024-01-10T12:00:00Z",
-                "has_weapons": True
-            }
-        }
-    )
+    @computed_field(description="Total number of detections")
+    @property
+    def detection_count(self) -> int:
+        """Number of detections."""
+        return len(self.detections)
+    
+    @computed_field(description="Whether any weapons were detected")
+    @property
+    def has_weapons(self) -> bool:
+        """Whether the detection list is non-empty (every model class is a weapon)."""
+        return bool(self.detections)
+    
+    model_config = ConfigDict(json_schema_extra={"example": EXAMPLES["ImageDetectionResponse"]})
 
 
 class VideoStreamConfig(BaseModel):
@@ -124,11 +120,11 @@ class VideoStreamConfig(BaseModel):
         ge=0,
         description="Camera device ID (0 for default webcam)"
     )
-    confidence_threshold: Optional[float] = Field(
-        None,
-        ge=0.0,
+    confidence_threshold: float = Field(
+        USE_DEFAULT_CONFIDENCE,
+        ge=-1.0,
         le=1.0,
-        description="Minimum confidence threshold for detections"
+        description="Minimum confidence threshold for detections (negative uses the server default)"
     )
     frame_skip: int = Field(
         0,
@@ -140,39 +136,29 @@ class VideoStreamConfig(BaseModel):
         description="Whether to save annotated frames"
     )
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "camera_id": 0,
-                "confidence_threshold": 0.5,
-                "frame_skip": 2,
-                "save_frames": False
-            }
-        }
-    )
+    model_config = ConfigDict(json_schema_extra={"example": EXAMPLES["VideoStreamConfig"]})
 
 
 class VideoFrameDetection(BaseModel):
     """Detection result for a single video frame."""
     frame_number: int = Field(..., description="Frame sequence number")
     detections: List[Detection] = Field(..., description="List of detected objects")
-    detection_count: int = Field(..., description="Total number of detections")
     inference_time_ms: float = Field(..., description="Inference time in milliseconds")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Frame timestamp")
-    has_weapons: bool = Field(..., description="Whether any weapons were detected")
+    timestamp_ms: int = Field(default_factory=epoch_ms, description="Frame time (Unix epoch, milliseconds)")
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "frame_number": 42,
-                "detections": [],
-                "detection_count": 0,
-                "inference_time_ms": 38.5,
-                "timestamp": "2024-01-10T12:00:00Z",
-                "has_weapons": False
-            }
-        }
-    )
+    @computed_field(description="Total number of detections")
+    @property
+    def detection_count(self) -> int:
+        """Number of detections."""
+        return len(self.detections)
+    
+    @computed_field(description="Whether any weapons were detected")
+    @property
+    def has_weapons(self) -> bool:
+        """Whether the detection list is non-empty (every model class is a weapon)."""
+        return bool(self.detections)
+    
+    model_config = ConfigDict(json_schema_extra={"example": EXAMPLES["VideoFrameDetection"]})
 
 
 class HealthResponse(BaseModel):
@@ -181,33 +167,21 @@ class HealthResponse(BaseModel):
     version: str = Field(..., description="API version")
     model_loaded: bool = Field(..., description="Whether YOLO model is loaded")
     gpu_available: bool = Field(..., description="Whether GPU is available")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Health check timestamp")
+    timestamp: datetime = Field(default_factory=utc_now, description="Health check timestamp")
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "status": "healthy",
-                "version": "1.0.0",
-                "model_loaded": True,
-                "gpu_available": True,
-                "timestamp": "2024-01-10T12:00:00Z"
-            }
-        }
-    )
+    model_config = ConfigDict(json_schema_extra={"example": EXAMPLES["HealthResponse"]})
 
 
 class ErrorResponse(BaseModel):
     """Standard error response."""
     error: str = Field(..., description="Error message")
     detail: Optional[str] = Field(None, description="Detailed error information")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
+    timestamp: datetime = Field(default_factory=utc_now, description="Error timestamp")
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "error": "Invalid image format",
-                "detail": "Supported formats: .jpg, .jpeg, .png, .bmp, .webp",
-                "timestamp": "2024-01-10T12:00:00Z"
-            }
-        }
-    )
+    model_config = ConfigDict(json_schema_extra={"example": EXAMPLES["ErrorResponse"]})
+
+
+# Serializers built once at import and reused for every response
+DETECTIONS_ADAPTER = TypeAdapter(List[Detection])
+IMAGE_RESPONSE_ADAPTER = TypeAdapter(ImageDetectionResponse)
+FRAME_RESPONSE_ADAPTER = TypeAdapter(VideoFrameDetection)
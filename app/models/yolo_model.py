@@ -2,42 +2,48 @@
 YOLO model wrapper with singleton pattern.
 Ensures single model instance across the application for efficient GPU memory usage.
 """
-from ultralytics import YOLO
-from typing import Optional, List, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, List, Any, Mapping, TYPE_CHECKING
 from pathlib import Path
-import torch
+import hashlib
 import threading
 from app.core.logging import get_logger
 from app.core.exceptions import ModelLoadException
 from app.config import Settings
+from app.utils.preprocess import model_capture_size
+
+if TYPE_CHECKING:
+    from ultralytics import YOLO
+
+# torch, ultralytics and numpy are imported inside the methods that need them,
+# so importing this module (schemas, health checks, tooling) stays cheap
 
 logger = get_logger("yolo_model")
 
+_NOT_LOADED_INFO: Mapping[str, Any] = MappingProxyType({"loaded": False})
+DEFAULT_IMGSZ = 640  # Ultralytics default, for checkpoints that don't record their training size
+
 
 class YOLOModelWrapper:
     """
-    Singleton wrapper for YOLO model.
-    Ensures only one model instance exists, preventing GPU memory duplication.
+    Wrapper for YOLO model.
+    A single shared instance is provided by get_model(), preventing GPU memory duplication.
     Thread-safe implementation for concurrent requests.
     """
     
-    _instance: Optional["YOLOModelWrapper"] = None
-    _lock: threading.Lock = threading.Lock()
-    
-    def __new__(cls):
-        """Implement singleton pattern with thread safety."""
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-        return cls._instance
-    
     def __init__(self):
-        """Initialize YOLO model wrapper (only called once)."""
-        if not hasattr(self, "_initialized"):
-            self._initialized = False
-            self.model: Optional[YOLO] = None
-            self._settings: Optional[Settings] = None
+        """Initialize YOLO model wrapper (model loaded by load_model())."""
+        # Set once the model is usable; steady-state checks are a single flag read
+        self._loaded = threading.Event()
+        self.model: Optional["YOLO"] = None
+        self._settings: Optional[Settings] = None
+        self._predict_defaults: Dict[str, Any] = {}
+        self._info: Mapping[str, Any] = _NOT_LOADED_INFO
+        self._weights_sha256: Optional[str] = None
+        self._fingerprint: Optional[str] = None
+        self._load_lock = threading.Lock()
+        self._inference_lock = threading.Lock()
     
     def load_model(self, settings: Settings) -> None:
         """
@@ -49,15 +55,20 @@ class YOLOModelWrapper:
         Raises:
             ModelLoadException: If model fails to load
         """
-        if self._initialized and self.model is not None:
+        if self._loaded.is_set():
             logger.info("Model already loaded, skipping initialization")
             return
         
-        with self._lock:
-            if self._initialized and self.model is not None:
+        # Concurrent callers wait here for the first load. They block on the lock
+        # rather than the event, so a failed load lets the next caller retry.
+        with self._load_lock:
+            if self._loaded.is_set():
                 return
             
             try:
+                import torch
+                from ultralytics import YOLO
+                
                 logger.info(f"Loading YOLO model from: {settings.model_path}")
                 
                 # Check if model file exists
@@ -70,39 +81,101 @@ class YOLOModelWrapper:
                 
                 # Load model
                 self.model = YOLO(settings.model_path)
+                self._weights_sha256 = self._weights_digest(model_path)
+                gpu_name = None
+                
+                # Serve at the size the checkpoint was trained at unless configured otherwise
+                if settings.imgsz is None:
+                    settings = settings.model_copy(update={"imgsz": self._checkpoint_imgsz()})
+                logger.info(f"Model input size: {settings.imgsz}")
+                
+                # Everything that changes the detections for a given image and threshold
+                self._fingerprint = (
+                    f"{self._weights_sha256[:16]}-iou{settings.iou_threshold:g}-{settings.imgsz}"
+                )
                 
                 # Check GPU availability
                 if settings.device == "cuda":
                     if not torch.cuda.is_available():
                         logger.warning("CUDA requested but not available, falling back to CPU")
-                        settings.device = "cpu"
-                        settings.half_precision = False
+                        settings = settings.with_device("cpu", half_precision=False)
                     else:
                         gpu_name = torch.cuda.get_device_name(0)
                         gpu_memory = torch.cuda.get_device_properties(0).total_memory / 1e9
                         logger.info(f"GPU detected: {gpu_name} ({gpu_memory:.2f} GB)")
+                        
+                        # Autotune conv algorithms once per input shape
+                        if settings.cudnn_benchmark:
+                            torch.backends.cudnn.benchmark = True
+                        torch.set_float32_matmul_precision("high")
                 
-                # Move model to device
+                # Move model to device and fold Conv+BN layers
                 self.model.to(settings.device)
+                self.model.fuse()
                 
                 # Enable half precision if requested and supported
                 if settings.half_precision and settings.device == "cuda":
                     logger.info("Enabling FP16 (half precision) mode for faster inference")
+                    self.model.model.half()
                 
-                self._settings = settings
-                self._initialized = True
+                # Swap in a TensorRT engine / ONNX model (exported once, reused on later startups)
+                if settings.export_tensorrt and settings.device == "cuda":
+                    self.model = self._load_tensorrt_engine(settings)
+                elif settings.export_onnx and settings.device == "cpu":
+                    self.model = self._load_onnx_model(settings)
+                
+                # Device and precision are model-level defaults, not per-call arguments
+                self.model.overrides.update(device=settings.device, half=settings.half_precision)
+                
+                # Fixed predict() arguments, resolved once instead of on every request
+                self._predict_defaults = {
+                    "conf": settings.confidence_threshold,
+                    "iou": settings.iou_threshold,
+                    "imgsz": settings.imgsz,
+                    "project": str(settings.runs_dir),
+                    "verbose": False,
+                }
                 
-                # Warm up the model with a dummy inference
+                # Warm up with an on-device tensor: the first pass sets up the predictor and
+                # autotunes kernels, the second primes the caching allocator
                 logger.info("Warming up model...")
-                import numpy as np
-                dummy_image = np.zeros((640, 640, 3), dtype=np.uint8)
-                self.model.predict(
-                    dummy_image,
-                    conf=settings.confidence_threshold,
-                    device=settings.device,
-                    half=settings.half_precision,
-                    verbose=False
+                use_channels_last = (
+                    settings.channels_last and settings.device == "cuda" and not settings.export_tensorrt
                 )
+                warmup = torch.zeros(
+                    (1, 3, settings.imgsz, settings.imgsz),
+                    device=settings.torch_device,
+                    dtype=settings.torch_dtype
+                )
+                if use_channels_last:
+                    warmup = warmup.contiguous(memory_format=torch.channels_last)
+                
+                self.model.predict(warmup, conf=settings.confidence_threshold, verbose=False)
+                
+                # NHWC weights for Tensor Core kernels (applied to the predictor's fused copy)
+                if use_channels_last:
+                    self._predictor_backend().model.to(memory_format=torch.channels_last)
+                
+                self.model.predict(warmup, conf=settings.confidence_threshold, verbose=False)
+                
+                # Specialize the network for the fixed input shape (not needed for TensorRT)
+                if settings.compile_model and settings.device == "cuda" and not settings.export_tensorrt:
+                    self._compile_network(settings)
+                
+                # Read-only snapshot served by model_info (no torch calls at read time)
+                self._info = MappingProxyType({
+                    "loaded": True,
+                    "device": settings.device,
+                    "model_path": settings.model_path,
+                    "confidence_threshold": settings.confidence_threshold,
+                    "half_precision": settings.half_precision,
+                    "imgsz": settings.imgsz,
+                    "gpu_name": gpu_name,
+                })
+                
+                # Only now is the model usable: requests and readiness see a warmed-up network
+                self._settings = settings
+                self._loaded.set()
                 
                 logger.info("Model loaded and warmed up successfully")
                 
@@ -113,6 +186,157 @@ class YOLOModelWrapper:
                     details={"error": str(e)}
                 )
     
+    def _checkpoint_imgsz(self) -> int:
+        """
+        Get the input size the loaded checkpoint was trained at.
+        
+        Returns:
+            Square input size (the longer side for rectangular training sizes)
+        """
+        imgsz = self.model.overrides.get("imgsz") or DEFAULT_IMGSZ
+        if isinstance(imgsz, (list, tuple)):
+            imgsz = max(imgsz)
+        return int(imgsz)
+    
+    def _predictor_backend(self) -> Any:
+        """
+        Get the object holding the network the predictor actually runs.
+        The predictor's AutoBackend deep-copies and fuses the model, so changes
+        made to `self.model.model` after the first predict() are not seen.
+        """
+        autobackend = self.model.predictor.model
+        # Recent Ultralytics versions wrap the network in a per-format backend
+        return getattr(autobackend, "backend", autobackend)
+    
+    def _compile_network(self, settings: Settings) -> None:
+        """
+        Compile the underlying network with torch.compile and warm it up.
+        Runs after the first predict() call so the predictor (and its fused
+        AutoBackend copy of the network) already exists. The graph is compiled
+        with dynamic shapes, since the batcher dispatches any batch size up to
+        `batch_max_size` and inputs can be rectangular. Warm-up runs every batch
+        size on square uploads and on capture-sized stream frames, twice each,
+        so compilation and CUDA graph capture for the serving shapes happen
+        before requests are accepted.
+        
+        Args:
+            settings: Application settings containing batching configuration
+        """
+        import numpy as np
+        import torch
+        
+        logger.info("Compiling model with torch.compile (reduce-overhead, dynamic shapes)...")
+        backend = self._predictor_backend()
+        backend.model = torch.compile(backend.model, mode="reduce-overhead", dynamic=True)
+        
+        if settings.capture_width is not None and settings.capture_height is not None:
+            capture_size = (settings.capture_width, settings.capture_height)
+        else:
+            capture_size = model_capture_size(settings.imgsz)
+        shapes = {(settings.imgsz, settings.imgsz)}
+        if all(capture_size):
+            shapes.add((capture_size[1], capture_size[0]))
+        
+        for height, width in sorted(shapes):
+            dummy_image = np.zeros((height, width, 3), dtype=np.uint8)
+            for batch_size in range(1, settings.batch_max_size + 1):
+                # First call compiles (or reuses the dynamic graph) and runs eagerly, second
+                # records the CUDA graph. Same arguments as serving, so the predictor isn't rebuilt
+                for _ in range(2):
+                    self._predict([dummy_image] * batch_size, False, self._predict_defaults)
+        
+        logger.info("Model compiled and warmed up")
+    
+    @staticmethod
+    def _weights_digest(model_path: Path) -> str:
+        """SHA-256 hex digest of a weights file."""
+        digest = hashlib.sha256()
+        with open(model_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _export_path(self, settings: Settings, tag: str, suffix: str) -> Path:
+        """
+        Path of a cached export for the current weights.
+        Keyed by a hash of the weights (plus a format-specific tag), so
+        changed weights trigger a fresh export instead of loading a stale one.
+        """
+        model_path = Path(settings.model_path)
+        name = "-".join(filter(None, (model_path.stem, self._weights_sha256[:12], tag)))
+        return model_path.with_name(name + suffix)
+    
+    def _load_tensorrt_engine(self, settings: Settings) -> "YOLO":
+        """
+        Load the TensorRT engine for the current model, exporting it if missing.
+        
+        Args:
+            settings: Application settings containing export configuration
+            
+        Returns:
+            YOLO model backed by the TensorRT engine
+        """
+        import torch
+        from ultralytics import YOLO
+        
+        # An engine is only valid for the GPU architecture it was built on
+        major, minor = torch.cuda.get_device_capability()
+        # Engine precision (Ultralytics' unified quantize argument): INT8, FP16 or FP32
+        quantize = 8 if settings.int8 else 16 if settings.half_precision else None
+        tag = f"sm{major}{minor}" + ("-int8" if quantize == 8 else "")
+        engine_path = self._export_path(settings, tag, ".engine")
+        
+        if not engine_path.exists():
+            logger.info("Exporting TensorRT engine (one-time, this can take several minutes)...")
+            # Dynamic batch dimension so the engine serves the batcher's variable batch sizes
+            exported_path = Path(self.model.export(
+                format="engine",
+                quantize=quantize,
+                data=settings.calibration_data,
+                dynamic=True,
+                batch=settings.batch_max_size,
+                imgsz=settings.imgsz,
+                workspace=settings.trt_workspace_gb,
+                device=settings.device
+            ))
+            exported_path.replace(engine_path)
+        
+        logger.info(f"Loading TensorRT engine from: {engine_path}")
+        return YOLO(str(engine_path), task="detect")
+    
+    def _load_onnx_model(self, settings: Settings) -> "YOLO":
+        """
+        Load the ONNX export of the current model (run by ONNX Runtime), exporting it if missing.
+        
+        Args:
+            settings: Application settings containing export configuration
+            
+        Returns:
+            YOLO model backed by ONNX Runtime
+        """
+        from ultralytics import YOLO
+        
+        # INT8 or FP32 (ONNX Runtime on CPU has no FP16 benefit)
+        quantize = 8 if settings.int8 else None
+        onnx_path = self._export_path(settings, "int8" if quantize == 8 else "", ".onnx")
+        
+        if not onnx_path.exists():
+            logger.info("Exporting ONNX model (one-time)...")
+            # INT8 uses post-training static quantization, calibrated on `calibration_data`
+            exported_path = Path(self.model.export(
+                format="onnx",
+                quantize=quantize,
+                data=settings.calibration_data,
+                dynamic=True,
+                batch=settings.batch_max_size,
+                imgsz=settings.imgsz,
+                device="cpu"
+            ))
+            exported_path.replace(onnx_path)
+        
+        logger.info(f"Loading ONNX model from: {onnx_path}")
+        return YOLO(str(onnx_path), task="detect")
+    
     def predict(
         self,
         source: Any,
@@ -139,29 +363,29 @@ class YOLOModelWrapper:
         Raises:
             ModelLoadException: If model is not loaded
         """
-        if not self._initialized or self.model is None:
+        if not self._loaded.is_set():
             raise ModelLoadException("Model not loaded. Call load_model() first.")
         
-        # Use default settings if not provided
-        if conf is None:
-            conf = self._settings.confidence_threshold
-        if iou is None:
-            iou = self._settings.iou_threshold
-        if project is None:
-            project = str(self._settings.runs_dir)
+        # Use default settings if not provided; callers may override any of them via kwargs
+        if conf is None and iou is None and project is None and not kwargs:
+            predict_kwargs = self._predict_defaults
+        else:
+            predict_kwargs = {**self._predict_defaults, **{
+                key: value
+                for key, value in (("conf", conf), ("iou", iou), ("project", project))
+                if value is not None
+            }, **kwargs}
         
-        # Run inference
-        results = self.model.predict(
-            source=source,
-            conf=conf,
-            iou=iou,
-            device=self._settings.device,
-            half=self._settings.half_precision,
-            save=save,
-            project=project,
-            verbose=False,
-            **kwargs
-        )
+        return self._predict(source, save, predict_kwargs)
+    
+    def _predict(self, source: Any, save: bool, predict_kwargs: Dict[str, Any]) -> List[Any]:
+        """Run inference with resolved arguments (no loaded check, also used during warmup)."""
+        import torch
+        
+        # Run inference (the underlying predictor is not safe for concurrent calls).
+        # Grad mode is thread-local and this runs on worker threads, so disable autograd here.
+        with self._inference_lock, torch.inference_mode():
+            results = self.model.predict(source=source, save=save, **predict_kwargs)
         
         return results
     
@@ -189,7 +413,7 @@ class YOLOModelWrapper:
         Raises:
             ModelLoadException: If model is not loaded
         """
-        if not self._initialized or self.model is None:
+        if not self._loaded.is_set():
             raise ModelLoadException("Model not loaded. Call load_model() first.")
         
         if conf is None:
@@ -197,23 +421,29 @@ class YOLOModelWrapper:
         if project is None:
             project = str(self._settings.runs_dir)
         
-        results = self.model.track(
-            source=source,
-            conf=conf,
-            device=self._settings.device,
-            half=self._settings.half_precision,
-            save=save,
-            project=project,
-            verbose=False,
-            **kwargs
-        )
+        import torch
+        
+        with self._inference_lock, torch.inference_mode():
+            results = self.model.track(
+                source=source,
+                conf=conf,
+                save=save,
+                project=project,
+                verbose=False,
+                **kwargs
+            )
         
         return results
     
     @property
     def is_loaded(self) -> bool:
         """Check if model is loaded."""
-        return self._initialized and self.model is not None
+        return self._loaded.is_set()
+    
+    @property
+    def settings(self) -> Optional[Settings]:
+        """Get the effective settings (device reflects any CPU fallback)."""
+        return self._settings
     
     @property
     def device(self) -> str:
@@ -223,24 +453,21 @@ class YOLOModelWrapper:
         return "unknown"
     
     @property
-    def model_info(self) -> dict:
-        """Get model information."""
-        if not self.is_loaded:
-            return {"loaded": False}
-        
-        return {
-            "loaded": True,
-            "device": self.device,
-            "model_path": self._settings.model_path,
-            "confidence_threshold": self._settings.confidence_threshold,
-            "half_precision": self._settings.half_precision,
-        }
+    def fingerprint(self) -> Optional[str]:
+        """Get the identity of the loaded weights and result-affecting settings (None until loaded)."""
+        return self._fingerprint
+    
+    @property
+    def model_info(self) -> Mapping[str, Any]:
+        """Get model information (read-only snapshot taken at load time)."""
+        return self._info
 
 
 # Global function to get model instance
+@lru_cache(maxsize=1)
 def get_model() -> YOLOModelWrapper:
     """
-    Get the singleton YOLO model instance.
+    Get the shared YOLO model instance.
     
     Returns:
         YOLOModelWrapper instance
@@ -0,0 +1,188 @@
+"""
+Dynamic batching for YOLO inference.
+Coalesces concurrent detection requests into a single forward pass.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import time
+
+from app.models.yolo_model import get_model
+from app.core.logging import get_logger
+from app.config import Settings
+
+logger = get_logger("batcher")
+
+
+class DynamicBatcher:
+    """
+    Server-side dynamic batcher.
+    Requests are queued and a background task groups up to `max_batch_size`
+    of them (or whatever arrived within `max_latency_ms`) into one
+    `model.predict` call, then resolves each caller with its own result.
+    """
+    
+    def __init__(self):
+        """Initialize the batcher (not running until start() is called)."""
+        self.model = get_model()
+        self.max_batch_size: int = 16
+        self.max_latency_ms: float = 10.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_batch_size: int = 0
+        # Requests taken off the queue but not yet resolved (failed by stop())
+        self._in_flight: List[Tuple[Any, float, asyncio.Future]] = []
+    
+    @property
+    def is_running(self) -> bool:
+        """Check if the background batching task is running."""
+        return self._task is not None and not self._task.done()
+    
+    def start(self, settings: Settings) -> None:
+        """
+        Start the background batching task on the running event loop.
+        
+        Args:
+            settings: Application settings containing batching configuration
+        """
+        if self.is_running:
+            return
+        
+        self.max_batch_size = settings.batch_max_size
+        self.max_latency_ms = settings.batch_max_latency_ms
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background task and fail any request still waiting, queued or mid-batch."""
+        if self._task is None:
+            return
+        
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        
+        pending, self._in_flight = self._in_flight, []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+        
+        logger.info("Dynamic batcher stopped")
+    
+    async def submit(self, image: Any, conf: float) -> Tuple[Any, float]:
+        """
+        Queue an image for batched inference and wait for its result.
+        
+        Args:
+            image: Decoded BGR numpy array, or preprocessed (1, 3, H, W) tensor
+            conf: Confidence threshold for this request
+        
+        Returns:
+            Tuple of (YOLO result for this image, batch inference time in ms)
+        """
+        if not self.is_running:
+            # No background task (e.g. service used outside the app lifespan)
+            return await self._predict_now(image, conf)
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, conf, future))
+        return await future
+    
+    async def _predict_now(self, image: Any, conf: float) -> Tuple[Any, float]:
+        """Run a single unbatched inference in a worker thread."""
+        start_time = time.time()
+        results = await asyncio.to_thread(self.model.predict, source=image, conf=conf)
+        inference_time = (time.time() - start_time) * 1000
+        return results[0], inference_time
+    
+    async def _collect(self, batch: List[Tuple[Any, float, asyncio.Future]]) -> List[Tuple[Any, float, asyncio.Future]]:
+        """Wait for a first request, then gather more into `batch` until it is full or the window closes."""
+        loop = asyncio.get_running_loop()
+        batch.append(await self._queue.get())
+        
+        # A lone request with no recent concurrency is dispatched right away,
+        # so single-client latency doesn't pay the batching window
+        if self._last_batch_size <= 1 and self._queue.empty():
+            self._last_batch_size = 1
+            return batch
+        
+        deadline = loop.time() + self.max_latency_ms / 1000
+        
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        self._last_batch_size = len(batch)
+        return batch
+    
+    @staticmethod
+    def _source_kind(image: Any) -> Any:
+        """Group key for an input: tensors batch by shape, arrays batch freely."""
+        import torch
+        
+        if isinstance(image, torch.Tensor):
+            return tuple(image.shape[1:])
+        return None
+    
+    @staticmethod
+    def _make_batch(images: List[Any]) -> Any:
+        """Build a predict() source: (N, 3, H, W) tensor for preprocessed frames, list otherwise."""
+        import torch
+        
+        if isinstance(images[0], torch.Tensor):
+            return torch.cat(images) if len(images) > 1 else images[0]
+        return images
+    
+    async def _run(self) -> None:
+        """Background loop: collect a batch, run one forward pass per threshold, dispatch results."""
+        while True:
+            # Collected requests stay tracked until resolved, so stop() can fail them
+            self._in_flight = []
+            batch = await self._collect(self._in_flight)
+            
+            # predict() takes a single conf and one kind of source, so requests
+            # are grouped by threshold and by input type/shape
+            groups: Dict[Tuple[float, Any], List[Tuple[Any, asyncio.Future]]] = {}
+            for image, conf, future in batch:
+                if not future.cancelled():
+                    groups.setdefault((conf, self._source_kind(image)), []).append((image, future))
+            
+            for (conf, _), items in groups.items():
+                images = [image for image, _ in items]
+                try:
+                    start_time = time.time()
+                    results = await asyncio.to_thread(self.model.predict, source=self._make_batch(images), conf=conf)
+                    inference_time = (time.time() - start_time) * 1000
+                except Exception as e:
+                    logger.error(f"Batched inference failed: {str(e)}", exc_info=True)
+                    for _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                
+                for (_, future), result in zip(items, results):
+                    if not future.done():
+                        future.set_result((result, inference_time))
+                
+                logger.debug(f"Batch of {len(images)} processed in {inference_time:.2f}ms")
+
+
+@lru_cache()
+def get_batcher() -> DynamicBatcher:
+    """
+    Get the shared batcher instance.
+    
+    Returns:
+        DynamicBatcher instance
+    """
+    return DynamicBatcher()
@@ -0,0 +1,186 @@
+"""
+Camera capture pool.
+Keeps one persistent OpenCV capture per camera so requests don't pay device-open latency.
+"""
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Optional, Tuple
+import asyncio
+import cv2
+import numpy as np
+
+from app.core.logging import get_logger
+from app.core.exceptions import CameraNotFoundException
+from app.config import get_settings
+from app.models.yolo_model import get_model
+from app.utils.preprocess import model_capture_size
+
+logger = get_logger("camera_pool")
+
+
+class CameraPool:
+    """
+    Process-wide pool of open `cv2.VideoCapture` handles keyed by camera ID.
+    Each capture has its own lock, so concurrent frame requests and streams
+    on the same camera take turns reading from a single device handle.
+    """
+    
+    def __init__(
+        self,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        fourcc: Optional[str] = None
+    ):
+        """
+        Initialize an empty pool.
+        
+        Args:
+            width: Requested capture width (None matches the loaded model's input size, 0 keeps the driver default)
+            height: Requested capture height (None matches the loaded model's input size, 0 keeps the driver default)
+            fourcc: Requested pixel format, e.g. "MJPG" (None keeps the driver default)
+        """
+        self.width = width
+        self.height = height
+        self.fourcc = fourcc
+        self._cameras: Dict[int, Tuple[cv2.VideoCapture, asyncio.Lock]] = {}
+        self._open_lock = asyncio.Lock()
+    
+    def _open_capture(self, camera_id: int) -> cv2.VideoCapture:
+        """Open a camera at the configured resolution, keeping only the newest frame in the driver buffer."""
+        cap = cv2.VideoCapture(camera_id)
+        if not cap.isOpened():
+            cap.release()
+            raise CameraNotFoundException(
+                f"Cannot access camera {camera_id}",
+                details={"camera_id": camera_id}
+            )
+        
+        # Let the driver deliver smaller frames instead of resizing after read.
+        # The pixel format goes first, some backends reset the size when it changes.
+        if self.fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        width, height = self._resolution()
+        if width and height:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+    
+    def _resolution(self) -> Tuple[Optional[int], Optional[int]]:
+        """Requested (width, height): configured, or sized so frames take the fused preprocess path."""
+        if self.width is not None and self.height is not None:
+            return self.width, self.height
+        # The model input size is resolved at load time (it may come from the checkpoint)
+        model_settings = get_model().settings
+        if model_settings is None:
+            return None, None
+        return model_capture_size(model_settings.imgsz)
+    
+    async def _get(self, camera_id: int) -> Tuple[cv2.VideoCapture, asyncio.Lock]:
+        """Get the pooled capture and its lock, opening the camera on first use."""
+        entry = self._cameras.get(camera_id)
+        if entry is not None:
+            return entry
+        
+        async with self._open_lock:
+            entry = self._cameras.get(camera_id)
+            if entry is None:
+                cap = await asyncio.to_thread(self._open_capture, camera_id)
+                entry = (cap, asyncio.Lock())
+                self._cameras[camera_id] = entry
+                logger.info(f"Opened camera {camera_id}")
+            return entry
+    
+    async def open(self, camera_id: int) -> None:
+        """
+        Make sure a camera is open and pooled.
+        
+        Args:
+            camera_id: Camera device ID
+        
+        Raises:
+            CameraNotFoundException: If camera is not accessible
+        """
+        await self._get(camera_id)
+    
+    @asynccontextmanager
+    async def acquire(self, camera_id: int) -> AsyncIterator[cv2.VideoCapture]:
+        """
+        Exclusively borrow the pooled capture for a camera.
+        
+        Args:
+            camera_id: Camera device ID
+        
+        Yields:
+            Open VideoCapture handle
+        
+        Raises:
+            CameraNotFoundException: If camera is not accessible
+        """
+        cap, lock = await self._get(camera_id)
+        async with lock:
+            yield cap
+    
+    async def read(self, camera_id: int) -> Optional[np.ndarray]:
+        """
+        Read the newest frame from a camera.
+        A failed read drops the handle so the next request reopens the device.
+        
+        Args:
+            camera_id: Camera device ID
+        
+        Returns:
+            BGR frame, or None if no frame could be read
+        
+        Raises:
+            CameraNotFoundException: If camera is not accessible
+        """
+        async with self.acquire(camera_id) as cap:
+            ret, frame = await asyncio.to_thread(cap.read)
+            if not ret or frame is None:
+                self._evict(camera_id, cap)
+                return None
+            return frame
+    
+    async def fps(self, camera_id: int) -> float:
+        """
+        Get the frame rate reported by a camera's driver.
+        
+        Args:
+            camera_id: Camera device ID
+        
+        Returns:
+            Frames per second, or 0 if the driver doesn't report it
+        
+        Raises:
+            CameraNotFoundException: If camera is not accessible
+        """
+        async with self.acquire(camera_id) as cap:
+            return cap.get(cv2.CAP_PROP_FPS) or 0.0
+    
+    def _evict(self, camera_id: int, cap: cv2.VideoCapture) -> None:
+        """Remove and release a capture if it is still the pooled one."""
+        entry = self._cameras.get(camera_id)
+        if entry is not None and entry[0] is cap:
+            del self._cameras[camera_id]
+            cap.release()
+            logger.info(f"Released camera {camera_id}")
+    
+    def close(self) -> None:
+        """Release every pooled capture."""
+        for camera_id, (cap, _) in list(self._cameras.items()):
+            cap.release()
+            logger.info(f"Released camera {camera_id}")
+        self._cameras.clear()
+
+
+@lru_cache()
+def get_camera_pool() -> CameraPool:
+    """
+    Get the shared camera pool instance.
+    
+    Returns:
+        CameraPool instance
+    """
+    settings = get_settings()
+    return CameraPool(settings.capture_width, settings.capture_height, settings.capture_fourcc)
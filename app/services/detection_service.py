@@ -2,20 +2,27 @@
 Detection service - Business logic for weapon detection.
 Separates API layer from ML model operations.
 """
-from typing import List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Type, TypeVar, Any
 import numpy as np
 import cv2
-from PIL import Image
-import io
-import time
+import asyncio
+import logging
 from pathlib import Path
+from pydantic import BaseModel
+from datetime import datetime
 
 from app.models.yolo_model import get_model
+from app.services.batcher import get_batcher
+from app.services.camera_pool import get_camera_pool
+from app.services.frame_pacer import FramePacer
+from app.services.result_cache import ResultCache, ResultStore, content_hash
+from app.services.result_writer import get_result_writer
+from app.utils.preprocess import FramePreprocessor, fits_model_input, scale_result_to_frame
 from app.models.schemas import (
     Detection,
-    BoundingBox,
     ImageDetectionResponse,
-    VideoFrameDetection
+    VideoFrameDetection,
+    DETECTIONS_ADAPTER
 )
 from app.core.logging import get_logger
 from app.core.exceptions import (
@@ -27,8 +34,18 @@ from app.core.exceptions import (
 )
 from app.config import Settings
 
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+except ImportError:  # PyTurboJPEG is optional, fall back to cv2.imencode
+    TurboJPEG = None
+
 logger = get_logger("detection_service")
 
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+# (class_name, confidence, (x1, y1, x2, y2), class_id)
+DetectionRecord = Tuple[str, float, Tuple[float, float, float, float], int]
+
 
 class DetectionService:
     """
@@ -45,11 +62,85 @@ class DetectionService:
         """
         self.settings = settings
         self.model = get_model()
+        self.batcher = get_batcher()
+        self.cameras = get_camera_pool()
+        self.writer = get_result_writer()
+        self.result_cache = ResultCache(settings.result_cache_size)
+        self._result_store: Optional[ResultStore] = None
+        self._jpeg = self._init_jpeg_encoder()
+        self._camera_inputs: Dict[int, Tuple[FramePreprocessor, asyncio.Lock]] = {}
+    
+    @property
+    def result_store(self) -> Optional[ResultStore]:
+        """Disk result store for the loaded model (created on first use), or None if disabled."""
+        if self._result_store is None and self.settings.result_cache_dir and self.model.is_loaded:
+            try:
+                self._result_store = ResultStore(self.settings.result_cache_dir, self.model.fingerprint)
+            except OSError as e:
+                logger.warning(f"Result cache directory unavailable: {str(e)}")
+        return self._result_store
+    
+    @staticmethod
+    def _init_jpeg_encoder() -> Optional[Any]:
+        """
+        Create a shared libjpeg-turbo encoder if available.
+        
+        Returns:
+            TurboJPEG instance, or None to use cv2.imencode
+        """
+        if TurboJPEG is None:
+            return None
+        try:
+            return TurboJPEG()
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"libjpeg-turbo not available, using OpenCV JPEG encoder: {str(e)}")
+            return None
+    
+    def _encode_jpeg(self, image: np.ndarray) -> bytes:
+        """
+        Encode a BGR image as JPEG.
+        
+        Args:
+            image: BGR image array
+            
+        Returns:
+            JPEG bytes
+        """
+        if self.settings.gpu_jpeg and self.model.device == "cuda":
+            return self._encode_jpeg_gpu(image)
+        
+        if self._jpeg is not None:
+            # Encodes straight to bytes, no intermediate ndarray. 4:2:0 chroma (PyTurboJPEG
+            # defaults to 4:2:2) matches cv2.imencode and encodes fewer bytes per frame.
+            return self._jpeg.encode(image, quality=self.settings.jpeg_quality, jpeg_subsample=TJSAMP_420)
+        
+        _, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), self.settings.jpeg_quality])
+        return buffer.tobytes()
+    
+    def _encode_jpeg_gpu(self, image: np.ndarray) -> bytes:
+        """
+        Encode a BGR image as JPEG on the GPU with nvJPEG.
+        The DCT and entropy coding run on the device; only the compressed bytes come back.
+        
+        Args:
+            image: BGR image array
+            
+        Returns:
+            JPEG bytes
+        """
+        import torch
+        from torchvision.io import encode_jpeg
+        
+        # BGR (H, W, 3) -> RGB (3, H, W), converted on the device after the upload
+        frame = torch.from_numpy(np.ascontiguousarray(image)).to(self.model.settings.torch_device)
+        encoded = encode_jpeg(frame.permute(2, 0, 1).flip(0).contiguous(), quality=self.settings.jpeg_quality)
+        return encoded.cpu().numpy().tobytes()
     
     def _process_results(
         self,
         results: List[Any],
-        inference_time_ms: float
+        inference_time_ms: float,
+        image_size: Optional[Tuple[int, int]] = None
     ) -> Tuple[List[Detection], Tuple[int, int]]:
         """
         Process YOLO results into structured Detection objects.
@@ -57,53 +148,257 @@ class DetectionService:
         Args:
             results: Raw YOLO detection results
             inference_time_ms: Inference time in milliseconds
+            image_size: Input dimensions (width, height), if known by the caller
             
         Returns:
             Tuple of (detections list, image dimensions)
         """
-        detections = []
-        image_size = (0, 0)
+        records, image_size = self._extract_records(results, image_size)
+        return self._build_detections(records), image_size
+    
+    @staticmethod
+    def _extract_records(
+        results: List[Any],
+        image_size: Optional[Tuple[int, int]] = None
+    ) -> Tuple[List[DetectionRecord], Tuple[int, int]]:
+        """
+        Extract plain detection records from YOLO results.
+        
+        Args:
+            results: Raw YOLO detection results
+            image_size: Input dimensions (width, height), if known by the caller
+            
+        Returns:
+            Tuple of ((class_name, confidence, bbox, class_id) records, image dimensions)
+        """
+        records = []
         
-        if not results or len(results) == 0:
-            return detections, image_size
+        if not results:
+            return records, image_size or (0, 0)
         
         result = results[0]  # Get first result
         
-        # Get image dimensions
-        if hasattr(result, 'orig_shape'):
+        # Get image dimensions (callers usually pass them from the input array)
+        if image_size is None:
             image_size = (result.orig_shape[1], result.orig_shape[0])  # (width, height)
         
-        # Process detections
+        # boxes.data packs (x1, y1, x2, y2[, track_id], conf, cls) per row:
+        # one device-to-host copy for all boxes instead of one per column
         if result.boxes is not None and len(result.boxes) > 0:
-            boxes = result.boxes
+            names = result.names if hasattr(result, 'names') else {}
+            records = []
+            for row in result.boxes.data.tolist():
+                class_id = int(row[-1])
+                records.append((names.get(class_id, f"class_{class_id}"), row[-2], tuple(row[:4]), class_id))
+        
+        return records, image_size
+    
+    def _build_detections(self, records: List[DetectionRecord]) -> List[Detection]:
+        """
+        Build Detection objects from plain records.
+        
+        Args:
+            records: (class_name, confidence, bbox, class_id) records
             
-            for i in range(len(boxes)):
-                # Get bounding box coordinates
-                xyxy = boxes.xyxy[i].cpu().numpy()
-                
-                # Get confidence score
-                conf = float(boxes.conf[i].cpu().numpy())
-                
-                # Get class ID and name
-                cls_id = int(boxes.cls[i].cpu().numpy())
-                cls_name = result.names[cls_id] if hasattr(result, 'names') else f"class_{cls_id}"
-                
-                # Create detection object
-                detection = Detection(
-                    class_name=cls_name,
-                    confidence=conf,
-                    bounding_box=BoundingBox(
-                        x1=float(xyxy[0]),
-                        y1=float(xyxy[1]),
-                        x2=float(xyxy[2]),
-                        y2=float(xyxy[3])
-                    ),
-                    class_id=cls_id
-                )
-                
-                detections.append(detection)
+        Returns:
+            List of Detection objects
+        """
+        if self.settings.trusted_internal:
+            return [Detection.fast_build(n, p, tuple(b), c) for n, p, b, c in records]
+        
+        # Validate all detections in a single call
+        return DETECTIONS_ADAPTER.validate_python([
+            {"class_name": n, "confidence": p, "bbox": b, "class_id": c}
+            for n, p, b, c in records
+        ])
+    
+    async def _cache_lookup(self, key: Tuple[bytes, float]) -> Optional[Tuple[List[DetectionRecord], Tuple[int, int]]]:
+        """
+        Look up cached records, in memory first and then on disk.
+        
+        Args:
+            key: (content hash, confidence threshold)
+            
+        Returns:
+            Tuple of (records, image dimensions), or None on a miss
+        """
+        cached = self.result_cache.get(key)
+        if cached is None and self.result_store is not None:
+            stored = await asyncio.to_thread(self.result_store.get, key)
+            if stored is not None:
+                records, image_size = stored
+                cached = ([tuple(r) for r in records], tuple(image_size))
+                self.result_cache.put(key, cached)
+        return cached
+    
+    async def _cache_store(self, key: Tuple[bytes, float], value: Tuple[List[DetectionRecord], Tuple[int, int]]) -> None:
+        """Store records in memory and, when enabled, on disk (best-effort)."""
+        self.result_cache.put(key, value)
+        if self.result_store is not None:
+            # A failing disk tier must not fail a detection that already succeeded
+            try:
+                await asyncio.to_thread(self.result_store.put, key, value)
+            except OSError as e:
+                logger.warning(f"Failed to persist cached result: {str(e)}")
+    
+    def _resolve_confidence(self, confidence_threshold: Optional[float]) -> float:
+        """Request threshold, or the configured default when unset (None or negative sentinel)."""
+        if confidence_threshold is None or confidence_threshold < 0:
+            return self.settings.confidence_threshold
+        return confidence_threshold
+    
+    def _build_response(self, model: Type[ResponseT], **data: Any) -> ResponseT:
+        """
+        Assemble a response model from internally shaped data.
+        Validation is skipped when `trusted_internal` is enabled.
         
-        return detections, image_size
+        Args:
+            model: Response model class
+            **data: Field values
+            
+        Returns:
+            Response model instance
+        """
+        if self.settings.trusted_internal:
+            return model.model_construct(**data)
+        return model(**data)
+    
+    def _annotate(self, result: Any, image: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Draw a result's detections.
+        plot() copies the whole image before drawing, so results without boxes
+        reuse the input image instead (pixel-identical, no copy or draw pass).
+        
+        Args:
+            result: YOLO result for a single image
+            image: BGR input image, needed when the model was fed a preprocessed tensor
+            
+        Returns:
+            Annotated BGR image
+        """
+        if self.settings.skip_plot_if_empty and (result.boxes is None or len(result.boxes) == 0):
+            source = image if image is not None else result.orig_img
+            if isinstance(source, np.ndarray):
+                return source
+        return result.plot()
+    
+    def _render_jpeg(self, result: Any, image: Optional[np.ndarray] = None) -> bytes:
+        """
+        Draw a result's detections and encode the annotated image as JPEG.
+        plot() returns BGR, which the encoders take directly (no color conversion pass).
+        
+        Args:
+            result: YOLO result for a single image
+            image: BGR input image, needed when the model was fed a preprocessed tensor
+            
+        Returns:
+            JPEG bytes
+        """
+        return self._encode_jpeg(self._annotate(result, image))
+    
+    async def _save_annotated(self, result: Any) -> Path:
+        """
+        Render and save an annotated result image without blocking the event loop.
+        
+        Args:
+            result: YOLO result for a single image
+            
+        Returns:
+            Path of the saved JPEG
+        """
+        image_bytes = await asyncio.to_thread(self._render_jpeg, result)
+        path = self.settings.runs_dir / "detect" / f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.jpg"
+        await self.writer.write(path, image_bytes)
+        logger.debug(f"Annotated result saved to {path}")
+        return path
+    
+    def _decode_image(self, image_data: bytes) -> np.ndarray:
+        """
+        Decode raw image bytes into a BGR array.
+        
+        Args:
+            image_data: Raw image bytes (any buffer-protocol object)
+            
+        Returns:
+            Decoded image as a (H, W, 3) BGR numpy array
+            
+        Raises:
+            InvalidImageException: If image cannot be decoded
+        """
+        try:
+            # np.frombuffer wraps the upload buffer without copying it
+            image_np = cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image_np is None:
+                raise ValueError("Unsupported or corrupted image data")
+        except Exception as e:
+            logger.error(f"Failed to load image: {str(e)}")
+            raise InvalidImageException(
+                "Failed to load image. Ensure it's a valid image file.",
+                details={"error": str(e)}
+            )
+        
+        return image_np
+    
+    def _check_size(self, image_data: bytes) -> None:
+        """
+        Reject uploads above the configured size limit.
+        
+        Args:
+            image_data: Raw image bytes
+            
+        Raises:
+            ImageTooLargeException: If image exceeds size limit
+        """
+        if len(image_data) > self.settings.max_image_size:
+            raise ImageTooLargeException(
+                f"Image size {len(image_data)} exceeds maximum {self.settings.max_image_size}",
+                details={"size": len(image_data), "max_size": self.settings.max_image_size}
+            )
+    
+    async def _detect_upload(self, image_data: bytes, conf: float) -> Tuple[Any, float, Tuple[int, int]]:
+        """
+        Decode an uploaded image and run it through the batcher.
+        
+        Args:
+            image_data: Raw image bytes
+            conf: Confidence threshold
+            
+        Returns:
+            Tuple of (YOLO result, batch inference time in ms, image dimensions (width, height))
+            
+        Raises:
+            InvalidImageException: If image cannot be decoded
+        """
+        # Decode image off the event loop (CPU-bound)
+        image_np = await asyncio.to_thread(self._decode_image, image_data)
+        
+        # Run inference (batched with concurrent requests)
+        result, inference_time = await self.batcher.submit(image_np, conf)
+        return result, inference_time, (image_np.shape[1], image_np.shape[0])
+    
+    def _image_response(
+        self,
+        records: List[DetectionRecord],
+        image_size: Tuple[int, int],
+        inference_time: float
+    ) -> ImageDetectionResponse:
+        """
+        Build the image detection response from plain records.
+        
+        Args:
+            records: (class_name, confidence, bbox, class_id) records
+            image_size: Image dimensions (width, height)
+            inference_time: Inference time in milliseconds
+            
+        Returns:
+            ImageDetectionResponse with detection results
+        """
+        return self._build_response(
+            ImageDetectionResponse,
+            detections=self._build_detections(records),
+            inference_time_ms=round(inference_time, 2),
+            image_size=image_size
+        )
     
     async def detect_from_image_file(
         self,
@@ -115,7 +410,7 @@ class DetectionService:
         Perform detection on an uploaded image file.
         
         Args:
-            image_data: Raw image bytes
+            image_data: Raw image bytes (bytes or bytearray)
             confidence_threshold: Custom confidence threshold
             save_result: Whether to save annotated image
             
@@ -128,58 +423,38 @@ class DetectionService:
             DetectionException: If detection fails
         """
         try:
-            # Check image size
-            if len(image_data) > self.settings.max_image_size:
-                raise ImageTooLargeException(
-                    f"Image size {len(image_data)} exceeds maximum {self.settings.max_image_size}",
-                    details={"size": len(image_data), "max_size": self.settings.max_image_size}
-                )
-            
-            # Load image
-            try:
-                image = Image.open(io.BytesIO(image_data))
-                image_np = np.array(image)
-                
-                # Convert RGBA to RGB if necessary
-                if image_np.shape[-1] == 4:
-                    image_np = cv2.cvtColor(image_np, cv2.COLOR_RGBA2RGB)
-                elif len(image_np.shape) == 2:  # Grayscale
-                    image_np = cv2.cvtColor(image_np, cv2.COLOR_GRAY2RGB)
-                
-            except Exception as e:
-                logger.error(f"Failed to load image: {str(e)}")
-                raise InvalidImageException(
-                    "Failed to load image. Ensure it's a valid image file.",
-                    details={"error": str(e)}
-                )
+            self._check_size(image_data)
             
             # Use custom confidence threshold if provided
-            conf = confidence_threshold if confidence_threshold is not None else self.settings.confidence_threshold
-            
-            # Run inference
-            start_time = time.time()
-            results = self.model.predict(
-                source=image_np,
-                conf=conf,
-                save=save_result
-            )
-            inference_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+            conf = self._resolve_confidence(confidence_threshold)
             
-            # Process results
-            detections, image_size = self._process_results(results, inference_time)
+            # Serve identical re-uploads from the result cache (saving always re-runs)
+            cache_key = None
+            if not save_result and (self.result_cache.maxsize > 0 or self.result_store is not None):
+                cache_key = (await asyncio.to_thread(content_hash, image_data), conf)
+                cached = await self._cache_lookup(cache_key)
+                if cached is not None:
+                    records, image_size = cached
+                    logger.info(f"Image detection served from cache: {len(records)} objects")
+                    return self._image_response(records, image_size, 0.0)
             
-            # Create response
-            response = ImageDetectionResponse(
-                detections=detections,
-                detection_count=len(detections),
-                inference_time_ms=round(inference_time, 2),
-                image_size=image_size,
-                has_weapons=len(detections) > 0
-            )
+            result, inference_time, image_size = await self._detect_upload(image_data, conf)
             
-            logger.info(
-                f"Image detection completed: {len(detections)} objects detected in {inference_time:.2f}ms"
-            )
+            if save_result:
+                await self._save_annotated(result)
+            
+            # Process results (the cache keeps plain records, not response objects)
+            records, image_size = self._extract_records([result], image_size)
+            
+            if cache_key is not None:
+                await self._cache_store(cache_key, (records, image_size))
+            
+            response = self._image_response(records, image_size, inference_time)
+            
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"Image detection completed: {len(records)} objects detected in {inference_time:.2f}ms"
+                )
             
             return response
             
@@ -201,7 +476,7 @@ class DetectionService:
         Perform detection and return annotated image with detection results.
         
         Args:
-            image_data: Raw image bytes
+            image_data: Raw image bytes (bytes or bytearray)
             confidence_threshold: Custom confidence threshold
             
         Returns:
@@ -213,65 +488,23 @@ class DetectionService:
             DetectionException: If detection fails
         """
         try:
-            # Check image size
-            if len(image_data) > self.settings.max_image_size:
-                raise ImageTooLargeException(
-                    f"Image size {len(image_data)} exceeds maximum {self.settings.max_image_size}",
-                    details={"size": len(image_data), "max_size": self.settings.max_image_size}
-                )
-            
-            # Load image
-            try:
-                image = Image.open(io.BytesIO(image_data))
-                image_np = np.array(image)
-                
-                # Convert RGBA to RGB if necessary
-                if image_np.shape[-1] == 4:
-                    image_np = cv2.cvtColor(image_np, cv2.COLOR_RGBA2RGB)
-                elif len(image_np.shape) == 2:  # Grayscale
-                    image_np = cv2.cvtColor(image_np, cv2.COLOR_GRAY2RGB)
-                
-            except Exception as e:
-                logger.error(f"Failed to load image: {str(e)}")
-                raise InvalidImageException(
-                    "Failed to load image. Ensure it's a valid image file.",
-                    details={"error": str(e)}
-                )
+            self._check_size(image_data)
             
             # Use custom confidence threshold if provided
-            conf = confidence_threshold if confidence_threshold is not None else self.settings.confidence_threshold
-            
-            # Run inference
-            start_time = time.time()
-            results = self.model.predict(
-                source=image_np,
-                conf=conf,
-                save=False
-            )
-            inference_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-            
-            # Process results
-            detections, image_size = self._process_results(results, inference_time)
+            conf = self._resolve_confidence(confidence_threshold)
             
-            # Get annotated image
-            annotated_image = results[0].plot() if results and len(results) > 0 else image_np
+            result, inference_time, image_size = await self._detect_upload(image_data, conf)
+            records, image_size = self._extract_records([result], image_size)
             
-            # Convert annotated image to bytes (JPEG)
-            _, buffer = cv2.imencode('.jpg', cv2.cvtColor(annotated_image, cv2.COLOR_RGB2BGR))
-            annotated_bytes = buffer.tobytes()
+            # Draw and encode off the event loop (both are full-frame CPU passes)
+            annotated_bytes = await asyncio.to_thread(self._render_jpeg, result)
             
-            # Create response
-            response = ImageDetectionResponse(
-                detections=detections,
-                detection_count=len(detections),
-                inference_time_ms=round(inference_time, 2),
-                image_size=image_size,
-                has_weapons=len(detections) > 0
-            )
+            response = self._image_response(records, image_size, inference_time)
             
-            logger.info(
-                f"Image detection with annotation completed: {len(detections)} objects detected in {inference_time:.2f}ms"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"Image detection with annotation completed: {len(records)} objects detected in {inference_time:.2f}ms"
+                )
             
             return annotated_bytes, response
             
@@ -304,50 +537,40 @@ class DetectionService:
             DetectionException: If detection fails
         """
         try:
-            # Open camera
-            cap = cv2.VideoCapture(camera_id)
+            # Read frame from the pooled (already open) camera
+            frame = await self.cameras.read(camera_id)
             
-            if not cap.isOpened():
-                raise CameraNotFoundException(
-                    f"Cannot access camera {camera_id}",
-                    details={"camera_id": camera_id}
-                )
-            
-            # Read frame
-            ret, frame = cap.read()
-            cap.release()
-            
-            if not ret or frame is None:
+            if frame is None:
                 raise VideoStreamException(
                     "Failed to capture frame from camera",
                     details={"camera_id": camera_id}
                 )
             
             # Use custom confidence threshold if provided
-            conf = confidence_threshold if confidence_threshold is not None else self.settings.confidence_threshold
-            
-            # Run inference
-            start_time = time.time()
-            results = self.model.predict(
-                source=frame,
-                conf=conf,
-                save=False
-            )
-            inference_time = (time.time() - start_time) * 1000
+            conf = self._resolve_confidence(confidence_threshold)
+            
+            # Run inference (batched with other requests and streams)
+            if self.settings.fused_preprocess:
+                preprocess, input_lock = self._camera_input(camera_id)
+                # The pinned buffer is reused, so hold it until this frame's inference is done
+                async with input_lock:
+                    result, inference_time = await self._infer_frame(frame, conf, preprocess)
+            else:
+                result, inference_time = await self._infer_frame(frame, conf, None)
+            results = [result]
             
             # Process results
-            detections, _ = self._process_results(results, inference_time)
+            detections, _ = self._process_results(results, inference_time, (frame.shape[1], frame.shape[0]))
             
-            # Get annotated frame
-            annotated_frame = results[0].plot() if results else frame
+            # Get annotated frame (drawn off the event loop)
+            annotated_frame = await asyncio.to_thread(self._annotate, result, frame)
             
             # Create response
-            detection_result = VideoFrameDetection(
+            detection_result = self._build_response(
+                VideoFrameDetection,
                 frame_number=0,
                 detections=detections,
-                detection_count=len(detections),
-                inference_time_ms=round(inference_time, 2),
-                has_weapons=len(detections) > 0
+                inference_time_ms=round(inference_time, 2)
             )
             
             return annotated_frame, detection_result
@@ -361,20 +584,127 @@ class DetectionService:
                 details={"error": str(e)}
             )
     
-    def generate_video_stream(
+    async def _capture_frames(self, camera_id: int, pacer: FramePacer, frames: asyncio.Queue) -> None:
+        """
+        Read frames from a pooled camera into a stream's queue.
+        Puts (frame_number, frame) items and a final None once the camera stops delivering.
+        
+        Args:
+            camera_id: Camera device ID
+            pacer: Decides which frames are skipped between detections
+            frames: Bounded queue consumed by the stream
+        """
+        frame_count = 0
+        try:
+            while True:
+                frame = await self.cameras.read(camera_id)
+                
+                if frame is None:
+                    logger.warning("Failed to read frame, ending stream")
+                    break
+                
+                # Skip frames (configured minimum, more while inference lags the camera)
+                if pacer.keep():
+                    await frames.put((frame_count, frame))
+                frame_count += 1
+        except Exception:
+            # Wake the consumer, the error is re-raised when it awaits this task
+            await frames.put(None)
+            raise
+        
+        await frames.put(None)
+    
+    def _camera_input(self, camera_id: int) -> Tuple[FramePreprocessor, asyncio.Lock]:
+        """
+        Get the reusable input buffer for single-frame requests on a camera.
+        
+        Args:
+            camera_id: Camera device ID
+            
+        Returns:
+            Tuple of (preprocessor, lock guarding its buffers)
+        """
+        entry = self._camera_inputs.get(camera_id)
+        if entry is None:
+            preprocess = FramePreprocessor(self.model.settings.torch_device, self.model.settings.torch_dtype)
+            entry = (preprocess, asyncio.Lock())
+            self._camera_inputs[camera_id] = entry
+        return entry
+    
+    async def _infer_frame(
+        self,
+        frame: np.ndarray,
+        conf: float,
+        preprocess: Optional[FramePreprocessor]
+    ) -> Tuple[Any, float]:
+        """
+        Submit one camera frame to the batcher.
+        
+        Args:
+            frame: BGR camera frame
+            conf: Confidence threshold
+            preprocess: This frame's input buffer, or None to let Ultralytics preprocess
+            
+        Returns:
+            Tuple of (YOLO result, batch inference time in ms)
+        """
+        # Model-sized frames skip Ultralytics' letterbox pipeline, other frames
+        # are letterboxed in one fused pass on CPU
+        if preprocess is None:
+            return await self.batcher.submit(frame, conf)
+        # Input size resolved at load time (the configured one may defer to the checkpoint)
+        imgsz = self.model.settings.imgsz
+        if fits_model_input(frame, imgsz):
+            return await self.batcher.submit(preprocess(frame), conf)
+        if not preprocess.supports_letterbox:
+            return await self.batcher.submit(frame, conf)
+        
+        source, geometry = preprocess.letterbox(frame, imgsz)
+        result, inference_time = await self.batcher.submit(source, conf)
+        # Report boxes (and draw them) in frame coordinates
+        return scale_result_to_frame(result, frame, geometry), inference_time
+    
+    async def _detect_stream_frame(
+        self,
+        frame: np.ndarray,
+        conf: float,
+        preprocess: Optional[FramePreprocessor]
+    ) -> Tuple[Any, float, bytes]:
+        """
+        Run one stream frame through the batcher and render its annotated JPEG.
+        Rendering runs in a worker thread as soon as the frame's inference is done,
+        so the frames of a batch are drawn and encoded in parallel, off the event loop.
+        
+        Args:
+            frame: BGR camera frame
+            conf: Confidence threshold
+            preprocess: This frame's input buffer, or None to let Ultralytics preprocess
+            
+        Returns:
+            Tuple of (YOLO result, batch inference time in ms, annotated JPEG bytes)
+        """
+        result, inference_time = await self._infer_frame(frame, conf, preprocess)
+        frame_bytes = await asyncio.to_thread(self._render_jpeg, result, frame)
+        return result, inference_time, frame_bytes
+    
+    async def generate_video_stream(
         self,
         camera_id: int = 0,
         confidence_threshold: Optional[float] = None,
         frame_skip: int = 0
     ):
         """
-        Generator for video stream detection.
+        Async generator for video stream detection.
         Yields annotated frames and detection results.
+        Frames from all active streams share the dynamic batcher, so
+        concurrent cameras are inferred together in one forward pass.
+        Capture runs in its own task; frames that back up while the model is
+        busy (up to `stream_batch_size`) are inferred as one batch.
         
         Args:
             camera_id: Camera device ID
             confidence_threshold: Custom confidence threshold
-            frame_skip: Number of frames to skip between detections
+            frame_skip: Minimum number of frames to skip between detections
             
         Yields:
             Tuple of (annotated frame bytes, detection results)
@@ -383,72 +713,86 @@ class DetectionService:
             CameraNotFoundException: If camera is not accessible
             VideoStreamException: If streaming fails
         """
-        cap = None
-        frame_count = 0
+        capture: Optional[asyncio.Task] = None
         
         try:
-            # Open camera
-            cap = cv2.VideoCapture(camera_id)
-            
-            if not cap.isOpened():
-                raise CameraNotFoundException(
-                    f"Cannot access camera {camera_id}",
-                    details={"camera_id": camera_id}
-                )
+            # Open camera (or reuse the pooled handle) before announcing the stream
+            await self.cameras.open(camera_id)
             
             logger.info(f"Started video stream from camera {camera_id}")
             
-            conf = confidence_threshold if confidence_threshold is not None else self.settings.confidence_threshold
+            conf = self._resolve_confidence(confidence_threshold)
+            batch_size = max(1, self.settings.stream_batch_size)
+            pacer = FramePacer(
+                await self.cameras.fps(camera_id) or self.settings.video_fps,
+                min_skip=frame_skip,
+                adaptive=self.settings.adaptive_frame_skip
+            )
             
-            while True:
-                ret, frame = cap.read()
-                
-                if not ret or frame is None:
-                    logger.warning("Failed to read frame, ending stream")
+            # Per-stream input buffers, one per frame in flight, reused across frames
+            preprocessors = [
+                FramePreprocessor(self.model.settings.torch_device, self.model.settings.torch_dtype)
+                for _ in range(batch_size)
+            ] if self.settings.fused_preprocess else []
+            
+            # Capture runs ahead of inference, so reading the camera overlaps the forward pass
+            frames: asyncio.Queue = asyncio.Queue(maxsize=2 * batch_size)
+            capture = asyncio.create_task(self._capture_frames(camera_id, pacer, frames))
+            
+            ended = False
+            while not ended:
+                item = await frames.get()
+                if item is None:
                     break
                 
-                # Skip frames if configured
-                if frame_count % (frame_skip + 1) != 0:
-                    frame_count += 1
-                    continue
+                # Frames that piled up during the last inference are submitted together,
+                # so the batcher runs them in one forward pass
+                pending = [item]
+                while len(pending) < batch_size and not frames.empty():
+                    item = frames.get_nowait()
+                    if item is None:
+                        ended = True
+                        break
+                    pending.append(item)
                 
-                try:
-                    # Run inference
-                    start_time = time.time()
-                    results = self.model.predict(
-                        source=frame,
-                        conf=conf,
-                        save=False
-                    )
-                    inference_time = (time.time() - start_time) * 1000
-                    
-                    # Process results
-                    detections, _ = self._process_results(results, inference_time)
-                    
-                    # Get annotated frame
-                    annotated_frame = results[0].plot() if results else frame
-                    
-                    # Create detection result
-                    detection_result = VideoFrameDetection(
-                        frame_number=frame_count,
-                        detections=detections,
-                        detection_count=len(detections),
-                        inference_time_ms=round(inference_time, 2),
-                        has_weapons=len(detections) > 0
-                    )
-                    
-                    # Encode frame as JPEG
-                    _, buffer = cv2.imencode('.jpg', annotated_frame)
-                    frame_bytes = buffer.tobytes()
-                    
-                    yield frame_bytes, detection_result
-                    
-                except Exception as e:
-                    logger.error(f"Error processing frame {frame_count}: {str(e)}")
-                    continue
-                
-                frame_count += 1
+                outputs = await asyncio.gather(
+                    *(
+                        self._detect_stream_frame(frame, conf, preprocessors[i] if preprocessors else None)
+                        for i, (_, frame) in enumerate(pending)
+                    ),
+                    return_exceptions=True
+                )
                 
+                for (frame_number, frame), output in zip(pending, outputs):
+                    try:
+                        if isinstance(output, BaseException):
+                            raise output
+                        result, inference_time, frame_bytes = output
+                        # Frames of one forward pass share its cost
+                        pacer.update(inference_time / len(pending))
+                        
+                        # Process results
+                        detections, _ = self._process_results(
+                            [result], inference_time, (frame.shape[1], frame.shape[0])
+                        )
+                        
+                        # Create detection result
+                        detection_result = self._build_response(
+                            VideoFrameDetection,
+                            frame_number=frame_number,
+                            detections=detections,
+                            inference_time_ms=round(inference_time, 2)
+                        )
+                        
+                        yield frame_bytes, detection_result
+                        
+                    except Exception as e:
+                        logger.error(f"Error processing frame {frame_number}: {str(e)}")
+                        continue
+            
+            # Surface a capture failure (e.g. the camera could not be reopened)
+            await capture
+            
         except CameraNotFoundException:
             raise
         except Exception as e:
@@ -458,6 +802,6 @@ class DetectionService:
                 details={"error": str(e)}
             )
         finally:
-            if cap is not None:
-                cap.release()
-                logger.info("Camera released")
+            if capture is not None:
+                capture.cancel()
+            logger.info(f"Video stream from camera {camera_id} ended")
@@ -0,0 +1,70 @@
+"""
+Adaptive frame skipping for video streams.
+Skips as many camera frames as the detector can't keep up with.
+"""
+from typing import Optional
+
+
+class FramePacer:
+    """
+    Decides which camera frames a stream sends to the detector.
+    Keeps an exponential moving average of the per-frame inference cost and
+    skips `floor(cost / frame interval)` frames between detections, so the
+    detector stays busy without a backlog of stale frames. A fixed skip acts
+    as the lower bound.
+    """
+    
+    def __init__(
+        self,
+        fps: float,
+        min_skip: int = 0,
+        adaptive: bool = True,
+        smoothing: float = 0.1
+    ):
+        """
+        Initialize the pacer.
+        
+        Args:
+            fps: Camera frame rate
+            min_skip: Frames always skipped between detections
+            adaptive: Whether to raise the skip when inference is slower than the camera
+            smoothing: EMA weight of the newest inference time
+        """
+        self.frame_interval_ms = 1000.0 / fps
+        self.min_skip = min_skip
+        self.adaptive = adaptive
+        self.smoothing = smoothing
+        self.inference_ms: Optional[float] = None
+        self._since_kept: Optional[int] = None
+    
+    @property
+    def skip(self) -> int:
+        """Current number of frames to skip between detections."""
+        if not self.adaptive or self.inference_ms is None:
+            return self.min_skip
+        return max(self.min_skip, int(self.inference_ms / self.frame_interval_ms))
+    
+    def keep(self) -> bool:
+        """
+        Decide whether the next captured frame is sent to the detector.
+        
+        Returns:
+            True if the frame should be detected, False to drop it
+        """
+        if self._since_kept is not None and self._since_kept < self.skip:
+            self._since_kept += 1
+            return False
+        self._since_kept = 0
+        return True
+    
+    def update(self, inference_ms: float) -> None:
+        """
+        Record the inference cost of one detected frame.
+        
+        Args:
+            inference_ms: Inference time attributed to the frame in milliseconds
+        """
+        if self.inference_ms is None:
+            self.inference_ms = inference_ms
+        else:
+            self.inference_ms += self.smoothing * (inference_ms - self.inference_ms)
@@ -0,0 +1,135 @@
+"""
+Result cache for repeated image uploads.
+Memoizes detection results keyed by a content hash of the image bytes,
+in memory (LRU) and optionally on disk.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional, Tuple
+import hashlib
+import os
+import threading
+
+import orjson
+
+
+def content_hash(data: bytes) -> bytes:
+    """
+    Compute a fast 128-bit content hash.
+    
+    Args:
+        data: Raw bytes (any buffer-protocol object)
+    
+    Returns:
+        16-byte BLAKE2b digest
+    """
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class ResultCache:
+    """
+    Bounded, thread-safe LRU cache.
+    Least recently used entries are evicted once `maxsize` is reached.
+    """
+    
+    def __init__(self, maxsize: int = 512):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value and mark it as recently used.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.maxsize <= 0:
+            return
+        
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ResultStore:
+    """
+    Persistent result store: one JSON file per (content hash, threshold) key.
+    Survives restarts and is shared by workers using the same directory.
+    Results live under a per-model subdirectory, so changing the weights or
+    result-affecting settings never serves results computed by another model.
+    Methods block on file I/O; call them off the event loop.
+    """
+    
+    def __init__(self, directory: Path, fingerprint: str):
+        """
+        Initialize the store.
+        
+        Args:
+            directory: Root directory of the store
+            fingerprint: Model fingerprint naming the subdirectory holding the result files (created if missing)
+        """
+        self.directory = directory / fingerprint
+        self.directory.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, key: Tuple[bytes, float]) -> Path:
+        """File path for a (digest, confidence) key."""
+        digest, conf = key
+        return self.directory / f"{digest.hex()}-{conf:g}.json"
+    
+    def get(self, key: Tuple[bytes, float]) -> Optional[Any]:
+        """
+        Load a stored value.
+        
+        Args:
+            key: (content hash, confidence threshold)
+        
+        Returns:
+            Stored value (JSON types), or None if missing or unreadable
+        """
+        try:
+            return orjson.loads(self._path(key).read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+    
+    def put(self, key: Tuple[bytes, float], value: Any) -> None:
+        """
+        Store a JSON-serializable value (written atomically).
+        
+        Args:
+            key: (content hash, confidence threshold)
+            value: Value to store
+        """
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(orjson.dumps(value))
+        os.replace(tmp_path, path)
+
@@ -0,0 +1,67 @@
+"""
+Background writer for saved detection results.
+Performs file writes on a dedicated thread so requests never block on disk I/O.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+import asyncio
+
+from app.core.logging import get_logger
+
+logger = get_logger("result_writer")
+
+
+class ResultWriter:
+    """
+    Serializes result file writes onto a single background thread.
+    Writes are awaited as futures, so the event loop stays free and writes
+    don't compete with inference for the default thread pool.
+    """
+    
+    def __init__(self):
+        """Initialize the writer (thread created on start())."""
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    def start(self) -> None:
+        """Start the background writer thread."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-writer")
+    
+    async def stop(self) -> None:
+        """Wait for pending writes to finish and stop the writer thread."""
+        if self._executor is None:
+            return
+        
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True)
+        logger.info("Result writer stopped")
+    
+    async def write(self, path: Path, data: bytes) -> None:
+        """
+        Write bytes to a file without blocking the event loop.
+        
+        Args:
+            path: Destination file (parent directories are created)
+            data: File contents
+        """
+        # Without a started writer (e.g. outside the app lifespan) use the default pool
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._write_file, path, data)
+    
+    @staticmethod
+    def _write_file(path: Path, data: bytes) -> None:
+        """Blocking write, run on the writer thread."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+@lru_cache()
+def get_result_writer() -> ResultWriter:
+    """
+    Get the shared result writer instance.
+    
+    Returns:
+        ResultWriter instance
+    """
+    return ResultWriter()
@@ -2,24 +2,69 @@
 Image processing utilities.
 Helper functions for image validation and manipulation.
 """
-from typing import Tuple, List
-from pathlib import Path
+from typing import AbstractSet, Tuple
 import mimetypes
+import os
 
+import numpy as np
 
-def validate_image_format(filename: str, allowed_formats: List[str]) -> bool:
+from fastapi import UploadFile
+
+from app.core.exceptions import ImageTooLargeException
+
+UPLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
+
+# Load the MIME tables at import instead of lazily on the first get_mime_type() call
+mimetypes.init()
+
+
+def validate_image_format(filename: str, allowed_formats: AbstractSet[str]) -> bool:
     """
     Validate if file has an allowed image format.
     
     Args:
         filename: Name of the file to validate
-        allowed_formats: List of allowed file extensions (e.g., ['.jpg', '.png'])
+        allowed_formats: Set of lowercased allowed extensions (e.g., {'.jpg', '.png'})
         
     Returns:
         True if format is valid, False otherwise
     """
-    file_ext = Path(filename).suffix.lower()
-    return file_ext in allowed_formats
+    return os.path.splitext(filename)[1].lower() in allowed_formats
+
+
+async def read_upload(file: UploadFile, max_size: int, chunk_size: int = UPLOAD_CHUNK_SIZE) -> bytearray:
+    """
+    Read an uploaded file in chunks, enforcing the size limit while reading.
+    
+    Args:
+        file: Uploaded file
+        max_size: Maximum allowed size in bytes
+        chunk_size: Size of each read in bytes
+        
+    Returns:
+        File contents
+        
+    Raises:
+        ImageTooLargeException: As soon as the upload exceeds max_size
+    """
+    # Reject without reading when the multipart parser already knows the size
+    if file.size is not None and file.size > max_size:
+        raise ImageTooLargeException(
+            f"Image size {file.size} exceeds maximum {max_size}",
+            details={"size": file.size, "max_size": max_size}
+        )
+    
+    buffer = bytearray()
+    
+    while chunk := await file.read(chunk_size):
+        buffer += chunk
+        if len(buffer) > max_size:
+            raise ImageTooLargeException(
+                f"Image size exceeds maximum {max_size}",
+                details={"max_size": max_size}
+            )
+    
+    return buffer
 
 
 def get_mime_type(filename: str) -> str:
@@ -82,3 +127,30 @@ def calculate_iou(box1: Tuple[float, float, float, float],
         return 0.0
     
     return inter_area / union_area
+
+
+def calculate_iou_batch(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Calculate pairwise IoU between two sets of bounding boxes.
+    Vectorized equivalent of calculate_iou for M x N box pairs.
+    
+    Args:
+        boxes_a: (M, 4) array of boxes (x1, y1, x2, y2)
+        boxes_b: (N, 4) array of boxes (x1, y1, x2, y2)
+        
+    Returns:
+        (M, N) array of IoU values between 0 and 1
+    """
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+    
+    # Broadcast (M, 1) against (1, N) so all pairs are computed in one pass
+    inter_w = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2]) - np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    inter_h = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3]) - np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    inter_area = np.clip(inter_w, 0, None) * np.clip(inter_h, 0, None)
+    
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union_area = area_a[:, None] + area_b[None, :] - inter_area
+    
+    return np.divide(inter_area, union_area, out=np.zeros_like(inter_area), where=union_area > 0)
@@ -0,0 +1,302 @@
+"""
+Frame preprocessing utilities.
+Fused conversion of camera frames into model-ready input tensors.
+"""
+from typing import Any, NamedTuple, Optional, Tuple, TYPE_CHECKING
+import cv2
+import numpy as np
+
+if TYPE_CHECKING:
+    import torch
+
+# torch is imported inside FramePreprocessor, which is only built once the model is
+# loaded, so importing this module (and the app) doesn't pull it in
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, fall back to NumPy
+    njit = None
+
+MODEL_STRIDE = 32
+LETTERBOX_PAD = 114  # Ultralytics letterbox padding value
+
+
+if njit is not None:
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _bgr_hwc_to_rgb_chw(src, dst, scale):
+        """Write src[y, x, 2 - c] * scale into dst[c, y, x] in a single pass."""
+        height, width = src.shape[0], src.shape[1]
+        for y in range(height):
+            for x in range(width):
+                for c in range(3):
+                    dst[c, y, x] = src[y, x, 2 - c] * scale
+    
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _letterbox_bgr_to_rgb_chw(src, dst, new_h, new_w, top, left, pad, scale):
+        """
+        Bilinear-resize src into dst[:, top:top + new_h, left:left + new_w] and pad the
+        border, writing RGB, CHW and scaled values in a single pass over the output.
+        """
+        src_h, src_w = src.shape[0], src.shape[1]
+        out_h, out_w = dst.shape[1], dst.shape[2]
+        fy, fx = src_h / new_h, src_w / new_w
+        for y in range(out_h):
+            iy = y - top
+            if iy < 0 or iy >= new_h:
+                for c in range(3):
+                    for x in range(out_w):
+                        dst[c, y, x] = pad
+                continue
+            # Same sample positions as cv2.INTER_LINEAR (pixel centers aligned)
+            sy = max((iy + 0.5) * fy - 0.5, 0.0)
+            y0 = min(int(sy), src_h - 1)
+            y1 = min(y0 + 1, src_h - 1)
+            wy = sy - y0
+            for x in range(out_w):
+                ix = x - left
+                if ix < 0 or ix >= new_w:
+                    for c in range(3):
+                        dst[c, y, x] = pad
+                    continue
+                sx = max((ix + 0.5) * fx - 0.5, 0.0)
+                x0 = min(int(sx), src_w - 1)
+                x1 = min(x0 + 1, src_w - 1)
+                wx = sx - x0
+                for c in range(3):
+                    top_row = src[y0, x0, 2 - c] * (1.0 - wx) + src[y0, x1, 2 - c] * wx
+                    bottom_row = src[y1, x0, 2 - c] * (1.0 - wx) + src[y1, x1, 2 - c] * wx
+                    dst[c, y, x] = (top_row * (1.0 - wy) + bottom_row * wy) * scale
+else:
+    def _bgr_hwc_to_rgb_chw(src, dst, scale):
+        """NumPy fallback for the fused conversion."""
+        np.multiply(src[:, :, ::-1].transpose(2, 0, 1), scale, out=dst, casting="unsafe")
+    
+    def _letterbox_bgr_to_rgb_chw(src, dst, new_h, new_w, top, left, pad, scale):
+        """OpenCV/NumPy fallback for the fused letterbox."""
+        resized = cv2.resize(src, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        dst.fill(pad)
+        _bgr_hwc_to_rgb_chw(resized, dst[:, top:top + new_h, left:left + new_w], scale)
+
+
+class LetterboxGeometry(NamedTuple):
+    """Placement of a resized frame inside the padded model input."""
+    ratio: float  # Resize factor (model input pixels per frame pixel)
+    new_h: int  # Resized frame height
+    new_w: int  # Resized frame width
+    top: int  # Padding above the resized frame
+    left: int  # Padding left of the resized frame
+    out_h: int  # Padded input height (stride multiple)
+    out_w: int  # Padded input width (stride multiple)
+
+
+def letterbox_geometry(height: int, width: int, imgsz: int, stride: int = MODEL_STRIDE) -> LetterboxGeometry:
+    """
+    Compute the letterbox Ultralytics applies to a frame (minimum-rectangle padding).
+    
+    Args:
+        height: Frame height
+        width: Frame width
+        imgsz: Model input size
+        stride: Model stride
+    
+    Returns:
+        LetterboxGeometry for the frame
+    """
+    ratio = min(imgsz / height, imgsz / width)
+    new_h, new_w = round(height * ratio), round(width * ratio)
+    dh, dw = (imgsz - new_h) % stride / 2, (imgsz - new_w) % stride / 2
+    top, bottom = round(dh - 0.1), round(dh + 0.1)
+    left, right = round(dw - 0.1), round(dw + 0.1)
+    return LetterboxGeometry(ratio, new_h, new_w, top, left, new_h + top + bottom, new_w + left + right)
+
+
+def scale_result_to_frame(result: Any, frame: np.ndarray, geometry: LetterboxGeometry) -> Any:
+    """
+    Map a result predicted on a letterboxed tensor back onto the original frame.
+    
+    Args:
+        result: YOLO result for the letterboxed input
+        frame: Original BGR frame
+        geometry: Letterbox used to build the input
+    
+    Returns:
+        YOLO result with boxes in frame coordinates and the frame as its image
+    """
+    from ultralytics.engine.results import Results
+    from ultralytics.utils.ops import scale_boxes
+    
+    boxes = None
+    if result.boxes is not None:
+        height, width = frame.shape[:2]
+        boxes = result.boxes.data.clone()
+        # Undo the padding and resize, then clip to the frame (as Ultralytics' postprocess does)
+        scale_boxes(
+            (geometry.out_h, geometry.out_w), boxes[:, :4], (height, width),
+            ratio_pad=((geometry.new_h / height, geometry.new_w / width), (geometry.left, geometry.top))
+        )
+    return Results(frame, path=result.path, names=result.names, boxes=boxes, speed=result.speed)
+
+
+def model_capture_size(imgsz: int, stride: int = MODEL_STRIDE) -> Tuple[int, int]:
+    """
+    Get a 4:3 capture resolution whose frames fit the model input as-is.
+    
+    Args:
+        imgsz: Model input size
+        stride: Model stride
+    
+    Returns:
+        (width, height), e.g. (640, 480) for imgsz 640
+    """
+    return imgsz, imgsz * 3 // 4 // stride * stride
+
+
+def fits_model_input(frame: np.ndarray, imgsz: int, stride: int = MODEL_STRIDE) -> bool:
+    """
+    Check if a frame can be fed to the model as-is, without letterboxing.
+    Smaller frames are not: Ultralytics would upscale them to imgsz first.
+    
+    Args:
+        frame: (H, W, 3) image
+        imgsz: Model input size
+        stride: Model stride
+    
+    Returns:
+        True if the longer side is imgsz and both dimensions are stride multiples
+    """
+    height, width = frame.shape[:2]
+    return (
+        max(height, width) == imgsz
+        and height % stride == 0 and width % stride == 0
+    )
+
+
+class FramePreprocessor:
+    """
+    Converts BGR uint8 (H, W, 3) frames into RGB float (1, 3, H, W) tensors in [0, 1].
+    Buffers are allocated once per stream and reused for every frame.
+    On CPU the conversion is a single fused pass into a float buffer, and frames
+    that aren't model-sized can be letterboxed in the same pass. On CUDA the
+    raw uint8 frame is staged in pinned memory and uploaded asynchronously on a
+    dedicated stream (a quarter of the float32 bytes); the channel flip, transpose
+    and scaling then run on the GPU in the same stream. On integrated GPUs (Jetson)
+    host and device share DRAM, so the frame is copied straight to the device
+    buffer without the pinned staging copy.
+    """
+    
+    def __init__(self, device: Optional["torch.device"] = None, dtype: Optional["torch.dtype"] = None):
+        """
+        Initialize preprocessor (buffers allocated on first frame).
+        
+        Args:
+            device: Device the model runs on (CPU if not provided)
+            dtype: Model input dtype, the device buffer is converted to it during the upload (float32 if not provided)
+        """
+        import torch
+        
+        self.device = device if device is not None else torch.device("cpu")
+        self.dtype = dtype if dtype is not None else torch.float32
+        self._use_cuda = self.device.type == "cuda" and torch.cuda.is_available()
+        self._integrated = self._use_cuda and torch.cuda.get_device_properties(self.device).is_integrated
+        self._copy_stream = torch.cuda.Stream(self.device) if self._use_cuda and not self._integrated else None
+        self._copy_done: Optional["torch.cuda.Event"] = None
+        self._shape: Optional[tuple] = None
+        self._host: Optional["torch.Tensor"] = None
+        self._buffer: Optional[np.ndarray] = None
+        self._device_frame: Optional["torch.Tensor"] = None
+        self._device_buffer: Optional["torch.Tensor"] = None
+        self._geometry: Optional[Tuple[Tuple[int, int, int], LetterboxGeometry]] = None
+    
+    @property
+    def supports_letterbox(self) -> bool:
+        """Whether letterbox() is available (the fused letterbox runs on CPU only)."""
+        return not self._use_cuda
+    
+    def _allocate(self, height: int, width: int) -> None:
+        """Allocate host (pinned uint8 on CUDA, float on CPU) and device buffers for a frame size."""
+        import torch
+        
+        self._shape = (height, width)
+        if self._use_cuda:
+            self._device_frame = torch.empty((height, width, 3), dtype=torch.uint8, device=self.device)
+            self._device_buffer = torch.empty((1, 3, height, width), dtype=self.dtype, device=self.device)
+            if self._integrated:
+                self._copy_done = None
+                return
+            self._host = torch.empty((height, width, 3), dtype=torch.uint8, pin_memory=True)
+        else:
+            self._host = torch.empty((1, 3, height, width), dtype=torch.float32)
+        self._buffer = self._host.numpy()
+        self._copy_done = None
+    
+    def __call__(self, frame: np.ndarray) -> "torch.Tensor":
+        """
+        Preprocess a frame into the reusable input buffer.
+        
+        Args:
+            frame: BGR uint8 image of shape (H, W, 3)
+        
+        Returns:
+            Tensor of shape (1, 3, H, W), on the model device
+        """
+        height, width = frame.shape[:2]
+        if self._shape != (height, width):
+            self._allocate(height, width)
+        
+        if not self._use_cuda:
+            _bgr_hwc_to_rgb_chw(frame, self._buffer[0], np.float32(1.0 / 255.0))
+            return self._host
+        
+        import torch
+        
+        if self._integrated:
+            # Shared memory: a pinned staging copy would just be a second memcpy in the same DRAM.
+            # Everything runs on the default stream, ordered after any queued inference.
+            self._device_frame.copy_(torch.from_numpy(np.ascontiguousarray(frame)))
+            torch.mul(self._device_frame.permute(2, 0, 1).flip(0), 1.0 / 255.0, out=self._device_buffer[0])
+            return self._device_buffer
+        
+        # The previous asynchronous upload may still be reading the pinned buffer
+        if self._copy_done is not None:
+            self._copy_done.synchronize()
+        np.copyto(self._buffer, frame)
+        
+        with torch.cuda.stream(self._copy_stream):
+            # Don't overwrite device buffers still in use by queued inference
+            self._copy_stream.wait_stream(torch.cuda.default_stream(self.device))
+            self._device_frame.copy_(self._host, non_blocking=True)
+            torch.mul(self._device_frame.permute(2, 0, 1).flip(0), 1.0 / 255.0, out=self._device_buffer[0])
+            self._copy_done = self._copy_stream.record_event()
+        
+        # Inference (on the default stream) must not start before the upload lands
+        torch.cuda.default_stream(self.device).wait_event(self._copy_done)
+        return self._device_buffer
+    
+    def letterbox(self, frame: np.ndarray, imgsz: int) -> Tuple["torch.Tensor", LetterboxGeometry]:
+        """
+        Letterbox a frame into the reusable input buffer.
+        Resize, padding, channel flip, transpose and scaling happen in one pass,
+        matching Ultralytics' own letterbox (bilinear resize, gray padding).
+        
+        Args:
+            frame: BGR uint8 image of shape (H, W, 3)
+            imgsz: Model input size
+        
+        Returns:
+            Tuple of (tensor of shape (1, 3, H', W'), letterbox geometry)
+        """
+        height, width = frame.shape[:2]
+        key = (height, width, imgsz)
+        if self._geometry is None or self._geometry[0] != key:
+            self._geometry = (key, letterbox_geometry(height, width, imgsz))
+        geometry = self._geometry[1]
+        
+        if self._shape != (geometry.out_h, geometry.out_w):
+            self._allocate(geometry.out_h, geometry.out_w)
+        
+        scale = np.float32(1.0 / 255.0)
+        _letterbox_bgr_to_rgb_chw(
+            frame, self._buffer[0], geometry.new_h, geometry.new_w,
+            geometry.top, geometry.left, np.float32(LETTERBOX_PAD) * scale, scale
+        )
+        return self._host, geometry